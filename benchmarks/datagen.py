@@ -0,0 +1,53 @@
+"""
+Seeded synthetic datasets for benchmarking the preprocessing and EDA engines.
+"""
+import numpy as np
+import pandas as pd
+
+
+def make_dataset(
+    n_rows: int = 10_000,
+    n_numeric: int = 10,
+    n_categorical: int = 5,
+    missing_rate: float = 0.05,
+    cardinality: int = 20,
+    target: str = "classification",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Build a mixed-type frame with a 'target' column.
+
+    Categorical values follow a Zipf-like distribution so every column has a
+    few frequent levels and a long tail of rare ones (exercises rare-merging).
+    target: "classification" (0/1), "multiclass" (3 string labels) or "regression".
+    """
+    rng = np.random.RandomState(seed)
+    data = {}
+
+    numeric = rng.normal(size=(n_rows, n_numeric))
+    for i in range(n_numeric):
+        data[f"num_{i}"] = numeric[:, i]
+
+    weights = 1.0 / np.arange(1, cardinality + 1)
+    weights /= weights.sum()
+    levels = np.array([f"c{j}" for j in range(cardinality)], dtype=object)
+    for i in range(n_categorical):
+        data[f"cat_{i}"] = levels[rng.choice(cardinality, size=n_rows, p=weights)]
+
+    df = pd.DataFrame(data)
+
+    signal = numeric[:, : min(3, n_numeric)].sum(axis=1) if n_numeric else np.zeros(n_rows)
+    noise = rng.normal(scale=1.0, size=n_rows)
+    if target == "regression":
+        y = signal + noise
+    elif target == "multiclass":
+        y = np.array(["low", "mid", "high"], dtype=object)[np.digitize(signal + noise, [-1.0, 1.0])]
+    else:
+        y = (signal + noise > 0).astype(int)
+
+    if missing_rate > 0:
+        mask = rng.rand(n_rows, df.shape[1]) < missing_rate
+        df = df.mask(mask)
+
+    df["target"] = y
+    return df
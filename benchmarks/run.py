@@ -0,0 +1,160 @@
+"""
+Benchmark suite for the preprocessing and EDA engines.
+
+Runs each component on synthetic data at several scales and records wall
+time (best of N), throughput (rows/sec) and peak traced memory. Results can
+be saved as a JSON baseline and compared against a previous one; timings or
+memory worse than the tolerance are reported as regressions (exit code 1).
+
+Usage:
+    python -m benchmarks.run --scales small medium --save benchmarks/baselines/local.json
+    python -m benchmarks.run --scales small medium --compare benchmarks/baselines/local.json
+
+Baselines are machine-specific: compare runs from the same machine.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.datagen import make_dataset
+from core.eda.analyze import analyze_dataframe
+from core.preprocess import fit_preprocessor
+from core.preprocess.leakage import detect_leakage
+from core.preprocess.config import DEFAULT_CONFIG
+from core.preprocess.rare_category import RareCategoryMerger
+from core.utils.logger import profile, span
+
+SCALES = {
+    "tiny": dict(n_rows=500, n_numeric=4, n_categorical=3, cardinality=10),
+    "small": dict(n_rows=5_000, n_numeric=10, n_categorical=5, cardinality=20),
+    "medium": dict(n_rows=50_000, n_numeric=20, n_categorical=10, cardinality=100),
+    "large": dict(n_rows=200_000, n_numeric=40, n_categorical=20, cardinality=1_000),
+}
+
+
+def _rare_merge(df: pd.DataFrame):
+    cats = [c for c in df.columns if c.startswith("cat_")]
+    return RareCategoryMerger(threshold=DEFAULT_CONFIG["rare_threshold"]).fit_transform(df[cats])
+
+
+COMPONENTS: Dict[str, Callable[[pd.DataFrame], object]] = {
+    "fit_preprocessor": lambda df: fit_preprocessor(df, target_col="target"),
+    "detect_leakage": lambda df: detect_leakage(df, "target", DEFAULT_CONFIG),
+    "rare_category_merger": _rare_merge,
+    "analyze_dataframe": analyze_dataframe,
+}
+
+
+def measure(fn: Callable, df: pd.DataFrame, repeats: int = 3) -> Dict:
+    """Best-of-N wall time, then one extra run under tracemalloc for peak memory."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(df)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+
+    with profile(track_memory=True) as prof:
+        with span("benchmark"):
+            fn(df)
+    peak = prof.events[-1]["peak_mem_mb"]
+
+    return {
+        "seconds": round(best, 6),
+        "rows_per_sec": round(len(df) / best, 1) if best else None,
+        "peak_mem_mb": peak,
+    }
+
+
+def run_suite(scales: List[str], components: Optional[List[str]] = None, repeats: int = 3,
+              target: str = "classification", missing_rate: float = 0.05, seed: int = 0,
+              log=print) -> Dict:
+    components = components or list(COMPONENTS)
+    results = []
+    for scale in scales:
+        params = SCALES[scale]
+        df = make_dataset(missing_rate=missing_rate, target=target, seed=seed, **params)
+        for name in components:
+            stats = measure(COMPONENTS[name], df, repeats)
+            row = {"component": name, "scale": scale, "rows": len(df), "cols": df.shape[1], **stats}
+            results.append(row)
+            log(f"{name:<22} {scale:<7} {row['seconds']:>10.4f}s "
+                f"{row['rows_per_sec']:>12.0f} rows/s {row['peak_mem_mb']:>9.2f} MB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "pandas": pd.__version__,
+            "repeats": repeats,
+            "target": target,
+            "missing_rate": missing_rate,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+# absolute changes below these are treated as noise, whatever the ratio
+MIN_DELTA = {"seconds": 0.01, "peak_mem_mb": 1.0}
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """Return entries whose time or peak memory grew by more than `tolerance` (fraction)."""
+    base = {(r["component"], r["scale"]): r for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        ref = base.get((row["component"], row["scale"]))
+        if ref is None:
+            continue
+        for metric in ("seconds", "peak_mem_mb"):
+            old, new = ref.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1 + tolerance and new - old > MIN_DELTA[metric]:
+                regressions.append({
+                    "component": row["component"], "scale": row["scale"], "metric": metric,
+                    "baseline": old, "current": new, "ratio": round(ratio, 3),
+                })
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing and EDA components.")
+    parser.add_argument("--scales", nargs="+", default=["small", "medium"], choices=list(SCALES))
+    parser.add_argument("--components", nargs="+", default=None, choices=list(COMPONENTS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--target", default="classification", choices=["classification", "multiclass", "regression"])
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", default=None, help="write results JSON here")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 = +25%%")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.scales, args.components, args.repeats, args.target, args.missing_rate, args.seed)
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save).write_text(json.dumps(current, indent=2), encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['component']} [{r['scale']}] {r['metric']}: "
+                  f"{r['baseline']} -> {r['current']} (x{r['ratio']})")
+        if regressions:
+            return 1
+        print("No regressions beyond tolerance.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Offline batch scoring with a saved preprocessor (and optional model).
+
+Reads a CSV/Parquet file in fixed-size record batches, transforms/predicts
+across a process pool, and writes one Parquet part per batch in input order.
+A bounded number of batches is in flight at any time, so memory stays flat
+regardless of input size. Parts are written atomically, so a crashed run can
+be resumed with --resume and only the missing batches are recomputed.
+
+Usage:
+    python -m core.deploy.batch_score --pipeline artifacts/preprocessor.pkl \
+        --input data/big.csv --output scored/ [--model model.pkl] [--resume]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from core.preprocess.utils import input_column_kinds, load_pipeline
+from core.utils.file_handler import arrow_column_types, iter_batches, stable_column_types
+
+MANIFEST = "_manifest.json"
+
+# per-process state, populated once by _init_worker
+_PIPELINE = None
+_MODEL = None
+
+
+def _init_worker(pipeline_path: str, model_path: Optional[str]):
+    global _PIPELINE, _MODEL
+    _PIPELINE = load_pipeline(pipeline_path)
+    _MODEL = load_pipeline(model_path) if model_path else None
+
+
+def score_frame(df: pd.DataFrame, pipeline, model=None, keep_columns=None) -> pd.DataFrame:
+    """Transform one batch (and predict if a model is given)."""
+    X = pipeline.transform(df)
+    if hasattr(X, "toarray"):
+        X = X.toarray()
+
+    if model is not None:
+        out = pd.DataFrame({"prediction": model.predict(X)})
+        if hasattr(model, "predict_proba"):
+            proba = np.asarray(model.predict_proba(X))
+            for i in range(proba.shape[1]):
+                out[f"proba_{i}"] = proba[:, i]
+    else:
+        out = pd.DataFrame(X, columns=[f"f{i}" for i in range(X.shape[1])])
+
+    for col in keep_columns or []:
+        out[col] = df[col].to_numpy()
+    return out
+
+
+def _score_batch(index: int, table: pa.Table, keep_columns, out_dir: str) -> int:
+    df = table.to_pandas()
+    scored = score_frame(df, _PIPELINE, _MODEL, keep_columns)
+    final = Path(out_dir) / f"part-{index:06d}.parquet"
+    tmp = final.with_suffix(".tmp")
+    scored.to_parquet(tmp, index=False)
+    os.replace(tmp, final)  # atomic: a part either exists completely or not at all
+    return len(df)
+
+
+def _check_manifest(out_dir: Path, settings: dict, resume: bool):
+    path = out_dir / MANIFEST
+    if path.exists() and resume:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+        if previous != settings:
+            raise ValueError(f"Cannot resume: settings differ from previous run ({previous}).")
+        return
+    if any(out_dir.glob("part-*.parquet")) and not resume:
+        raise ValueError(f"{out_dir} already contains parts; pass --resume or use an empty directory.")
+    path.write_text(json.dumps(settings, indent=2), encoding="utf-8")
+
+
+def run(pipeline_path: str, input_path: str, output_dir: str, model_path: Optional[str] = None,
+        batch_size: int = 100_000, workers: int = 0, max_in_flight: Optional[int] = None,
+        keep_columns=None, resume: bool = False, block_size: int = 1 << 24, log=print) -> dict:
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    settings = {
+        "input": os.path.abspath(input_path),
+        "pipeline": os.path.abspath(pipeline_path),
+        "model": os.path.abspath(model_path) if model_path else None,
+        "batch_size": batch_size,
+        "keep_columns": list(keep_columns or []),
+    }
+    _check_manifest(out_dir, settings, resume)
+
+    done = {int(p.stem.split("-")[1]) for p in out_dir.glob("part-*.parquet")} if resume else set()
+    rows, skipped, start = 0, 0, time.perf_counter()
+
+    def report(n_batches):
+        elapsed = time.perf_counter() - start
+        log(f"batches={n_batches} rows={rows} skipped_batches={skipped} "
+            f"rows/sec={rows / elapsed if elapsed else 0:.0f}")
+
+    # pin the CSV schema to the training columns: first-block type inference would
+    # fail mid-run (and again on --resume) on a later value of another type
+    column_types = arrow_column_types(input_column_kinds(load_pipeline(pipeline_path)))
+    if not input_path.endswith((".parquet", ".pq")):
+        # pass-through columns the pipeline doesn't know get widened first-block types
+        stable = stable_column_types(input_path, block_size)
+        column_types.update({c: stable[c] for c in keep_columns or [] if c in stable and c not in column_types})
+    batches = enumerate(iter_batches(input_path, batch_size, block_size, column_types))
+    n_batches = 0
+
+    if workers <= 0:
+        _init_worker(pipeline_path, model_path)
+        for i, table in batches:
+            n_batches = i + 1
+            if i in done:
+                skipped += 1
+                continue
+            rows += _score_batch(i, table, keep_columns, str(out_dir))
+            report(n_batches)
+    else:
+        # back-pressure: never hold more than max_in_flight batches in memory
+        limit = max_in_flight or 2 * workers
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(pipeline_path, model_path)) as pool:
+            for i, table in batches:
+                n_batches = i + 1
+                if i in done:
+                    skipped += 1
+                    continue
+                pending.append(pool.submit(_score_batch, i, table, keep_columns, str(out_dir)))
+                # results are consumed in submission order
+                while len(pending) >= limit:
+                    rows += pending.popleft().result()
+                    report(n_batches)
+            while pending:
+                rows += pending.popleft().result()
+                report(n_batches)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "batches": n_batches,
+        "skipped_batches": skipped,
+        "rows_scored": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed else None,
+        "output_dir": str(out_dir),
+    }
+    log(json.dumps(stats))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file with a saved preprocessing pipeline.")
+    parser.add_argument("--pipeline", required=True, help="path to preprocessor.pkl")
+    parser.add_argument("--model", default=None, help="optional fitted model (.pkl) applied after the pipeline")
+    parser.add_argument("--input", required=True, help="input .csv or .parquet")
+    parser.add_argument("--output", required=True, help="output directory for part-*.parquet files")
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 = score in-process")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="default: 2 x workers")
+    parser.add_argument("--keep-columns", nargs="*", default=[], help="input columns copied to the output")
+    parser.add_argument("--resume", action="store_true", help="skip batches already written")
+    args = parser.parse_args(argv)
+
+    run(
+        pipeline_path=args.pipeline,
+        input_path=args.input,
+        output_dir=args.output,
+        model_path=args.model,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        keep_columns=args.keep_columns,
+        resume=args.resume,
+        log=lambda msg: print(msg, file=sys.stderr),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Input drift monitoring for a served preprocessing pipeline.
+
+Reference: per-feature histograms frozen at training time
+(core/preprocess/drift_reference.py), saved next to the pipeline artifact.
+
+Online: every feature keeps a fixed-size count vector over its reference
+bins, so memory is O(bins) per feature regardless of traffic. Requests only
+enqueue their frame (never blocking); a background thread folds batches into
+the sketches and scores the window every `interval` seconds with PSI and a
+binned KS statistic.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.utils.logger import span
+
+EPS = 1e-4
+# common PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 drift
+PSI_MODERATE = 0.1
+PSI_DRIFT = 0.25
+
+
+# -----------------------------
+# Online sketches
+# -----------------------------
+
+class NumericSketch:
+    """Counts over fixed reference bins, plus a missing bucket."""
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 2, dtype=np.int64)
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+        missing = np.isnan(values)
+        bins = np.searchsorted(self.edges, values[~missing], side="right")
+        self.counts[:-1] += np.bincount(bins, minlength=len(self.edges) + 1)
+        self.counts[-1] += int(missing.sum())
+
+    def reset(self):
+        self.counts[:] = 0
+
+
+class CategoricalSketch:
+    """Counts per reference category, plus "other" and missing buckets."""
+    def __init__(self, categories):
+        self.categories = pd.Index([str(c) for c in categories])
+        self.counts = np.zeros(len(self.categories) + 2, dtype=np.int64)
+
+    def update(self, values):
+        values = pd.Series(values)
+        present = values.notna().to_numpy()
+        codes = self.categories.get_indexer(values[present].astype(str))
+        known = codes >= 0
+        self.counts[:-2] += np.bincount(codes[known], minlength=len(self.categories))
+        self.counts[-2] += int((~known).sum())
+        self.counts[-1] += int((~present).sum())
+
+    def reset(self):
+        self.counts[:] = 0
+
+
+# -----------------------------
+# Scores
+# -----------------------------
+
+def psi(expected, counts) -> float:
+    """Population stability index of observed counts against expected shares."""
+    e = np.clip(np.asarray(expected, dtype=float), EPS, None)
+    a = np.clip(np.asarray(counts, dtype=float) / max(np.sum(counts), 1), EPS, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def binned_ks(expected, counts) -> float:
+    """KS statistic between binned CDFs (missing bucket excluded)."""
+    e = np.asarray(expected, dtype=float)[:-1]
+    a = np.asarray(counts, dtype=float)[:-1]
+    if e.sum() <= 0 or a.sum() <= 0:
+        return 0.0
+    return float(np.max(np.abs(np.cumsum(e / e.sum()) - np.cumsum(a / a.sum()))))
+
+
+def _status(value: float) -> str:
+    if value >= PSI_DRIFT:
+        return "drift"
+    if value >= PSI_MODERATE:
+        return "moderate"
+    return "stable"
+
+
+# -----------------------------
+# Monitor
+# -----------------------------
+
+class DriftMonitor:
+    """
+    Background drift scoring. observe() is the only call on the request
+    path: it enqueues the frame without blocking and drops it if the queue
+    is full, so scoring can never slow down requests.
+    """
+    def __init__(self, reference: Dict, interval: float = 60.0, min_samples: int = 200,
+                 max_queue: int = 256, history: int = 100):
+        self.reference = reference
+        self.interval = interval
+        self.min_samples = min_samples
+        self.sketches = {}
+        for col, ref in reference["numeric"].items():
+            self.sketches[col] = (NumericSketch(ref["edges"]), ref["expected"])
+        for col, ref in reference["categorical"].items():
+            self.sketches[col] = (CategoricalSketch(ref["categories"]), ref["expected"])
+        # references rebuilt from fitted stats may not know the training missing share
+        self.skip_missing = {col for kind in ("numeric", "categorical")
+                             for col, ref in reference[kind].items() if not ref.get("missing_known", True)}
+
+        self.rows = 0
+        self.dropped_batches = 0
+        self.reports = deque(maxlen=history)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # request path
+    def observe(self, df: pd.DataFrame) -> bool:
+        try:
+            self._queue.put_nowait(df)
+            return True
+        except queue.Full:
+            self.dropped_batches += 1
+            return False
+
+    # background side
+    def _update(self, df: pd.DataFrame):
+        with self._lock:
+            for col, (sketch, _) in self.sketches.items():
+                if col in df.columns:
+                    sketch.update(df[col])
+            self.rows += len(df)
+
+    def drain(self):
+        """Fold every queued batch into the sketches."""
+        while True:
+            try:
+                df = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._update(df)
+
+    def score(self, force: bool = False) -> Optional[Dict]:
+        """Score the current window and start a new one; None while the window is too small."""
+        self.drain()
+        with self._lock:
+            if self.rows == 0 or (self.rows < self.min_samples and not force):
+                return None
+            with span("drift.score", rows=self.rows):
+                features = {}
+                for col, (sketch, expected) in self.sketches.items():
+                    if col in self.skip_missing:
+                        value = psi(expected[:-1], sketch.counts[:-1])
+                    else:
+                        value = psi(expected, sketch.counts)
+                    features[col] = {"psi": round(value, 4), "status": _status(value)}
+                    if isinstance(sketch, NumericSketch):
+                        # binned_ks already ignores the missing bucket
+                        features[col]["ks"] = round(binned_ks(expected, sketch.counts), 4)
+                    sketch.reset()
+            report = {
+                "time": time.time(),
+                "rows": self.rows,
+                "dropped_batches": self.dropped_batches,
+                "features": features,
+                "drifted": sorted(c for c, f in features.items() if f["status"] == "drift"),
+            }
+            self.rows = 0
+            self.reports.append(report)
+        return report
+
+    def latest(self) -> Optional[Dict]:
+        return self.reports[-1] if self.reports else None
+
+    def _run(self):
+        next_score = time.monotonic() + self.interval
+        while not self._stop.is_set():
+            timeout = max(0.0, next_score - time.monotonic())
+            try:
+                self._update(self._queue.get(timeout=min(timeout, 1.0)))
+            except queue.Empty:
+                pass
+            if time.monotonic() >= next_score:
+                self.score()
+                next_score = time.monotonic() + self.interval
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,82 @@
+"""
+HTTP scoring for a saved preprocessing pipeline (and optional model), with
+input drift monitoring.
+
+Artifacts are read from config.toml [serving] artifacts_dir:
+    preprocessor.pkl       required (save_preprocess_artifacts)
+    drift_reference.json   training sketches; rebuilt from the fitted pipeline if absent
+    model.pkl              optional model applied after the pipeline
+
+Usage:
+    uvicorn core.deploy.fastapi_app:create_app_from_settings --factory
+"""
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import pandas as pd
+from fastapi import FastAPI
+
+from core.deploy.batch_score import score_frame
+from core.deploy.drift import DriftMonitor
+from core.deploy.request_schema import DriftResponse, PredictRequest, PredictResponse
+from core.preprocess.drift_reference import build_reference, load_reference
+from core.preprocess.utils import load_pipeline
+from core.utils.config import get_settings
+
+
+def create_app(pipeline_path: str, model_path: Optional[str] = None, reference_path: Optional[str] = None,
+               interval: float = 60.0, min_samples: int = 200, max_queue: int = 256) -> FastAPI:
+    pipeline = load_pipeline(pipeline_path)
+    model = load_pipeline(model_path) if model_path else None
+    if reference_path and os.path.exists(reference_path):
+        reference = load_reference(reference_path)
+    else:
+        reference = build_reference(pipeline)
+    monitor = DriftMonitor(reference, interval=interval, min_samples=min_samples, max_queue=max_queue)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        monitor.start()
+        yield
+        monitor.stop()
+
+    app = FastAPI(title="AutoDataset Lab scoring API", lifespan=lifespan)
+    app.state.monitor = monitor
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "model": model is not None, "monitored_features": len(monitor.sketches)}
+
+    @app.post("/predict", response_model=PredictResponse)
+    def predict(request: PredictRequest):
+        df = pd.DataFrame(request.records)
+        out = score_frame(df, pipeline, model)
+        # enqueue only; sketch updates and scoring happen on the monitor thread
+        monitor.observe(df)
+        return PredictResponse(rows=len(out), outputs=out.to_dict(orient="records"))
+
+    @app.get("/drift", response_model=DriftResponse)
+    def drift():
+        report = monitor.latest()
+        return DriftResponse(
+            status="ok" if report else "warming_up",
+            pending_rows=monitor.rows,
+            report=report,
+        )
+
+    return app
+
+
+def create_app_from_settings() -> FastAPI:
+    serving = get_settings()["serving"]
+    artifacts = serving["artifacts_dir"]
+    model_path = os.path.join(artifacts, "model.pkl")
+    return create_app(
+        pipeline_path=os.path.join(artifacts, "preprocessor.pkl"),
+        model_path=model_path if os.path.exists(model_path) else None,
+        reference_path=os.path.join(artifacts, "drift_reference.json"),
+        interval=serving["drift_interval_seconds"],
+        min_samples=serving["drift_min_samples"],
+        max_queue=serving["drift_max_queue"],
+    )
@@ -0,0 +1,18 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PredictRequest(BaseModel):
+    records: List[Dict[str, Any]] = Field(..., min_length=1, description="raw input rows, one dict per row")
+
+
+class PredictResponse(BaseModel):
+    rows: int
+    outputs: List[Dict[str, Any]]
+
+
+class DriftResponse(BaseModel):
+    status: str                          # "ok" once a window has been scored, else "warming_up"
+    pending_rows: int                    # rows folded into the current (unscored) window
+    report: Optional[Dict[str, Any]] = None
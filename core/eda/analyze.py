@@ -1,37 +1,65 @@
 import pandas as pd
+
+from core.utils.logger import span, traced
+from core.utils.helpers import report_progress
+from .association import categorical_association
+from .duplicates import find_duplicates
 print("DEBUG: analyze.py loaded")
 
-def analyze_dataframe(df: pd.DataFrame):
+@traced("analyze_dataframe")
+def analyze_dataframe(df: pd.DataFrame, progress=None, near: bool = True):
     """
     Full EDA analysis pack used by UI and report generator.
+    near=False skips the (MinHash) near-duplicate search and reports exact duplicates only.
     """
 
-    overview = {
-        "rows": df.shape[0],
-        "columns": df.shape[1],
-        "columns_list": df.columns.tolist(),
-    }
+    with span("analyze.overview"):
+        overview = {
+            "rows": df.shape[0],
+            "columns": df.shape[1],
+            "columns_list": df.columns.tolist(),
+        }
 
-    missing = df.isna().mean().round(4).to_dict()
+    report_progress(progress, 0.0, "missing values")
+    with span("analyze.missing"):
+        missing = df.isna().mean().round(4).to_dict()
 
-    dtypes = {col: str(df[col].dtype) for col in df.columns}
+    report_progress(progress, 0.2, "column types")
+    with span("analyze.dtypes"):
+        dtypes = {col: str(df[col].dtype) for col in df.columns}
 
-    column_types = {
-        "numeric": df.select_dtypes(include=["int64", "float64"]).columns.tolist(),
-        "categorical": df.select_dtypes(include=["object", "category"]).columns.tolist(),
-        "boolean": df.select_dtypes(include=["bool"]).columns.tolist(),
-        "datetime": df.select_dtypes(include=["datetime64"]).columns.tolist(),
-    }
+        column_types = {
+            "numeric": df.select_dtypes(include=["int64", "float64"]).columns.tolist(),
+            "categorical": df.select_dtypes(include=["object", "category"]).columns.tolist(),
+            "boolean": df.select_dtypes(include=["bool"]).columns.tolist(),
+            "datetime": df.select_dtypes(include=["datetime64"]).columns.tolist(),
+        }
 
+    report_progress(progress, 0.4, "numeric summary")
     numeric_summary = {}
     if column_types["numeric"]:
-        numeric_summary = df[column_types["numeric"]].describe().to_dict()
+        with span("analyze.numeric_summary"):
+            numeric_summary = df[column_types["numeric"]].describe().to_dict()
 
-    categorical_summary = {
-        col: df[col].value_counts().to_dict()
-        for col in column_types["categorical"]
-    }
+    report_progress(progress, 0.7, "categorical summary")
+    with span("analyze.categorical_summary"):
+        categorical_summary = {
+            col: df[col].value_counts().to_dict()
+            for col in column_types["categorical"]
+        }
+
+    report_progress(progress, 0.85, "categorical association")
+    categorical_assoc = {}
+    if len(column_types["categorical"]) > 1:
+        with span("analyze.categorical_association"):
+            assoc = categorical_association(df, column_types["categorical"])
+        categorical_assoc = {name: m.round(4).to_dict() for name, m in assoc.items()}
+
+    report_progress(progress, 0.95, "duplicate rows")
+    with span("analyze.duplicates", near=near):
+        duplicates = find_duplicates(df, near=near)
 
+    report_progress(progress, 1.0, "analysis done")
     return {
         "overview": overview,
         "missing": missing,
@@ -39,4 +67,6 @@ def analyze_dataframe(df: pd.DataFrame):
         "column_types": column_types,
         "numeric_summary": numeric_summary,
         "categorical_summary": categorical_summary,
+        "categorical_association": categorical_assoc,
+        "duplicates": duplicates,
     }
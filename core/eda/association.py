@@ -0,0 +1,136 @@
+"""
+Pairwise association between categorical columns.
+
+Each column is factorized to integer codes once. The contingency table of a
+pair is a single bincount over the combined code a * k_b + b (or a sort-based
+unique count when k_a * k_b is too large to allocate), and both statistics
+only need its non-zero cells:
+
+    Cramér's V   symmetric, chi2 = n * (sum O_ij^2 / (R_i C_j) - 1)
+    Theil's U    asymmetric, U(x|y) = (H(x) - H(x|y)) / H(x): how much
+                 knowing y tells us about x
+
+Column pairs are split across joblib workers for wide frames.
+"""
+from itertools import combinations
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from core.utils.config import resolve_n_jobs
+from core.utils.logger import span
+
+# above this many cells the contingency table is counted sparsely
+DENSE_CELL_LIMIT = 10_000_000
+# below this much total work (rows x pairs) parallelism isn't worth it
+PARALLEL_MIN_WORK = 50_000_000
+
+
+def _encode(df: pd.DataFrame, columns: List[str]):
+    codes, sizes = [], []
+    for col in columns:
+        c, uniques = pd.factorize(df[col], sort=False)
+        codes.append(c.astype(np.int64))
+        sizes.append(len(uniques))
+    return codes, sizes
+
+
+def _pair_counts(a, b, ka, kb):
+    """Non-zero contingency cells as (row code, col code, count) over rows where both are present."""
+    mask = (a >= 0) & (b >= 0)
+    a, b = a[mask], b[mask]
+    idx = a * kb + b
+    if ka * kb <= DENSE_CELL_LIMIT:
+        table = np.bincount(idx, minlength=ka * kb)
+        cells = np.flatnonzero(table)
+        counts = table[cells]
+    else:
+        cells, counts = np.unique(idx, return_counts=True)
+    return cells // kb, cells % kb, counts.astype(float)
+
+
+def _entropy(p):
+    p = p[p > 0]
+    return float(-(p * np.log(p)).sum())
+
+
+def _pair_stats(a, b, ka, kb, bias_correction: bool):
+    rows, cols, counts = _pair_counts(a, b, ka, kb)
+    n = counts.sum()
+    if n == 0:
+        return 0.0, 0.0, 0.0
+
+    row_tot = np.bincount(rows, weights=counts, minlength=ka)
+    col_tot = np.bincount(cols, weights=counts, minlength=kb)
+    r = int((row_tot > 0).sum())
+    k = int((col_tot > 0).sum())
+
+    # Cramér's V
+    chi2 = n * ((counts ** 2 / (row_tot[rows] * col_tot[cols])).sum() - 1.0)
+    phi2 = max(chi2 / n, 0.0)
+    if bias_correction and n > 1:
+        phi2 = max(0.0, phi2 - (k - 1) * (r - 1) / (n - 1))
+        r_c = r - (r - 1) ** 2 / (n - 1)
+        k_c = k - (k - 1) ** 2 / (n - 1)
+        denom = min(k_c - 1, r_c - 1)
+    else:
+        denom = min(k - 1, r - 1)
+    v = float(np.sqrt(phi2 / denom)) if denom > 0 else 0.0
+
+    # Theil's U in both directions
+    p = counts / n
+    h_a = _entropy(row_tot / n)
+    h_b = _entropy(col_tot / n)
+    h_ab = _entropy(p)
+    # H(a|b) = H(a,b) - H(b)
+    u_a_given_b = (h_a - (h_ab - h_b)) / h_a if h_a > 0 else 1.0
+    u_b_given_a = (h_b - (h_ab - h_a)) / h_b if h_b > 0 else 1.0
+    return v, float(u_a_given_b), float(u_b_given_a)
+
+
+def _pair_batch(pairs, codes, sizes, bias_correction):
+    return [(i, j, *_pair_stats(codes[i], codes[j], sizes[i], sizes[j], bias_correction)) for i, j in pairs]
+
+
+def categorical_association(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                            bias_correction: bool = True, n_jobs: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Cramér's V and Theil's U matrices for the categorical columns of df.
+    theils_u.loc[x, y] is U(x|y). Missing values are excluded pairwise.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=["object", "category", "bool"]).columns.tolist()
+
+    m = len(columns)
+    cramers = np.eye(m)
+    theils = np.eye(m)
+
+    if m >= 2:
+        with span("association.encode"):
+            codes, sizes = _encode(df, columns)
+
+        pairs = list(combinations(range(m), 2))
+        workers = resolve_n_jobs(n_jobs)
+        if workers > 1 and len(df) * len(pairs) >= PARALLEL_MIN_WORK:
+            batches = np.array_split(np.array(pairs), min(len(pairs), workers * 4))
+            with span("association.pairs", parallel=workers):
+                results = Parallel(n_jobs=workers)(
+                    delayed(_pair_batch)([tuple(p) for p in batch], codes, sizes, bias_correction)
+                    for batch in batches
+                )
+            results = [row for batch in results for row in batch]
+        else:
+            with span("association.pairs"):
+                results = _pair_batch(pairs, codes, sizes, bias_correction)
+
+        for i, j, v, u_ij, u_ji in results:
+            cramers[i, j] = cramers[j, i] = v
+            theils[i, j] = u_ij
+            theils[j, i] = u_ji
+
+    return {
+        "cramers_v": pd.DataFrame(cramers, index=columns, columns=columns),
+        "theils_u": pd.DataFrame(theils, index=columns, columns=columns),
+    }
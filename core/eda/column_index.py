@@ -0,0 +1,409 @@
+"""
+Persisted index of column fingerprints across uploaded datasets.
+
+Every column gets a fixed-size, L2-normalized fingerprint:
+
+    name       character trigram hashing of the normalized column name
+    kind       numeric / categorical / datetime / other
+    numeric    missing rate, uniqueness and a signed-log quantile sketch
+    values     frequency-weighted hashed value distribution (categoricals)
+
+Fingerprints live in a FAISS inner-product index (numpy brute force when
+faiss isn't installed), so nearest columns come back in milliseconds and
+carry the stored column profile and last preprocessing decisions. String and
+integer columns also keep a MinHash signature of their value set, used to
+estimate value containment between columns for join-key suggestions.
+
+The index is updated incrementally: adding a dataset only fingerprints its
+own columns, and re-adding unchanged data is a no-op.
+"""
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+try:
+    import faiss
+except:
+    faiss = None
+
+from core.nlp.profile import build_profile
+from core.utils.config import get_settings
+from core.utils.logger import span
+from .duplicates import minhash_signatures
+
+INDEX_DIR = Path(get_settings()["paths"]["cache_dir"]) / "column_index"
+
+NAME_DIM = 256
+KINDS = ("numeric", "categorical", "datetime", "other")
+QUANTILES = (0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0)
+NUMERIC_DIM = 16
+VALUES_DIM = 32
+DIM = NAME_DIM + len(KINDS) + NUMERIC_DIM + VALUES_DIM
+
+NUM_PERM = 64
+# a signature Jaccard below this is within MinHash noise (1 / NUM_PERM resolution),
+# so much smaller value sets (< ~1/8 of the other side) are not considered
+MIN_JOIN_JACCARD = 8 / NUM_PERM
+# one side of a join key must be at least this unique (distinct / non-missing)
+KEY_UNIQUE_RATIO = 0.95
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
+
+
+def _hash_buckets(tokens, dim: int, weights=None) -> np.ndarray:
+    out = np.zeros(dim)
+    if len(tokens):
+        buckets = pd.util.hash_array(np.asarray(tokens, dtype=object)) % np.uint64(dim)
+        np.add.at(out, buckets.astype(np.int64), 1.0 if weights is None else weights)
+    return out
+
+
+def name_tokens(name: str) -> List[str]:
+    # "CustomerID", "customer_id" and "customer id" normalize to the same string
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", str(name)).lower()
+    name = "#" + "_".join(re.findall(r"[a-z0-9]+", name)) + "#"
+    return [name[i:i + 3] for i in range(len(name) - 2)]
+
+
+def _slog(x):
+    return np.sign(x) * np.log1p(np.abs(x))
+
+
+def _kind(s: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(s):
+        return "categorical"
+    if pd.api.types.is_numeric_dtype(s):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return "datetime"
+    if s.dtype == object or isinstance(s.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(s):
+        return "categorical"
+    return "other"
+
+
+def _unique_ratio(s: pd.Series, n_unique: int) -> float:
+    non_missing = int(s.notna().sum())
+    return n_unique / non_missing if non_missing else 0.0
+
+
+def column_fingerprint(name: str, s: pd.Series):
+    """(vector, MinHash signature of the value set or None, n_unique) for one column."""
+    kind = _kind(s)
+    values = s.dropna()
+    n_unique = int(values.nunique())
+
+    name_block = _unit(_hash_buckets(name_tokens(name), NAME_DIM))
+    kind_block = np.array([k == kind for k in KINDS], dtype=float)
+
+    numeric_block = np.zeros(NUMERIC_DIM)
+    values_block = np.zeros(VALUES_DIM)
+    if kind == "numeric" and len(values):
+        x = values.to_numpy(dtype=float)
+        stats = np.r_[
+            s.isna().mean(),
+            n_unique / len(x),
+            float(np.all(x == np.round(x))),
+            _slog(np.quantile(x, QUANTILES)) / 10.0,
+            _slog(x.mean()) / 10.0,
+            np.log1p(x.std()) / 10.0,
+        ]
+        numeric_block[:len(stats)] = stats
+        numeric_block = _unit(numeric_block)
+    elif kind == "categorical" and len(values):
+        freq = values.astype(str).value_counts(normalize=True)
+        # sqrt of frequencies: inner products become the Bhattacharyya coefficient
+        values_block = _unit(np.sqrt(_hash_buckets(freq.index.to_numpy(), VALUES_DIM, freq.to_numpy())))
+
+    vector = _unit(np.r_[name_block, 0.5 * kind_block, numeric_block, values_block]).astype(np.float32)
+
+    signature = None
+    # only string/categorical and integer columns can be join keys
+    if n_unique >= 2 and (kind == "categorical" or pd.api.types.is_integer_dtype(s)):
+        tokens = pd.util.hash_array(values.astype(str).unique().astype(object))
+        signature = minhash_signatures(tokens[None, :], NUM_PERM)[0]
+    return vector, signature, n_unique
+
+
+def column_decisions(meta: Dict) -> Dict[str, Dict]:
+    """Per-column preprocessing decisions from fit_preprocessor's summary["meta"]."""
+    cfg = meta.get("config", {})
+    decisions = {}
+    for col in meta.get("numerics", []):
+        decisions[col] = {"role": "numeric", "imputer": cfg.get("imputer_numeric_strategy"),
+                          "scaler": cfg.get("scaler")}
+    for col in meta.get("onehot_categoricals", []):
+        decisions[col] = {"role": "onehot", "imputer": cfg.get("imputer_categorical_strategy"),
+                          "rare_threshold": cfg.get("rare_threshold")}
+    for col in meta.get("high_cardinality_categoricals", []):
+        decisions[col] = {"role": "high_cardinality", "encoding": meta.get("high_cardinality_encoding")}
+    return decisions
+
+
+class _NumpyIndex:
+    """Brute-force inner-product index with the FAISS IndexIDMap calls we use."""
+    def __init__(self, dim: int):
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.ids = np.zeros(0, dtype=np.int64)
+
+    @property
+    def ntotal(self):
+        return len(self.ids)
+
+    def add_with_ids(self, vectors, ids):
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.ids = np.r_[self.ids, ids]
+
+    def remove_ids(self, ids):
+        keep = ~np.isin(self.ids, ids)
+        self.vectors, self.ids = self.vectors[keep], self.ids[keep]
+
+    def search(self, queries, k):
+        scores = queries @ self.vectors.T
+        order = np.argsort(-scores, axis=1)[:, :k]
+        return np.take_along_axis(scores, order, axis=1), self.ids[order]
+
+
+def _new_index(dim: int):
+    if faiss is not None:
+        return faiss.IndexIDMap(faiss.IndexFlatIP(dim))
+    return _NumpyIndex(dim)
+
+
+def _dataset_hash(df: pd.DataFrame) -> str:
+    row_hash = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    h = hashlib.sha1(row_hash.tobytes())
+    h.update(repr(list(df.columns)).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ColumnIndex:
+    def __init__(self, directory=INDEX_DIR):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self.entries: Dict[int, Dict] = {}   # id -> dataset, column, kind, profile, decisions, signature, n_unique
+        self.datasets: Dict[str, str] = {}   # dataset name -> content hash
+        self.next_id = 0
+        self.index = _new_index(DIM)
+        self._load()
+
+    # ---------- persistence ----------
+    @property
+    def _meta_path(self):
+        return self.directory / "columns.pkl"
+
+    @property
+    def _faiss_path(self):
+        return self.directory / "index.faiss"
+
+    def _load(self):
+        if not self._meta_path.exists():
+            return
+        state = joblib.load(self._meta_path)
+        self.entries, self.datasets, self.next_id = state["entries"], state["datasets"], state["next_id"]
+        if faiss is not None and self._faiss_path.exists():
+            index = faiss.read_index(str(self._faiss_path))
+            if index.ntotal == len(self.entries):
+                self.index = index
+                return
+        # no (or stale) saved FAISS index: rebuild from the stored vectors
+        if self.entries:
+            ids = np.fromiter(self.entries, dtype=np.int64)
+            self.index.add_with_ids(np.vstack([self.entries[i]["vector"] for i in ids]), ids)
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self._meta_path.with_suffix(".tmp")
+        joblib.dump({"entries": self.entries, "datasets": self.datasets, "next_id": self.next_id}, tmp)
+        os.replace(tmp, self._meta_path)
+        if faiss is not None:
+            tmp = self._faiss_path.with_suffix(".tmp")
+            faiss.write_index(self.index, str(tmp))
+            os.replace(tmp, self._faiss_path)
+
+    # ---------- updates ----------
+    def add_dataset(self, dataset: str, df, save: bool = True) -> int:
+        """Fingerprint and index the columns of one dataset; returns the number of columns added."""
+        if hasattr(df, "to_pandas"):
+            df = df.to_pandas()
+        content = _dataset_hash(df)
+        with self._lock:
+            if self.datasets.get(dataset) == content:
+                return 0
+            self._remove(dataset)
+
+            with span("column_index.fingerprint", dataset=dataset, columns=df.shape[1]):
+                profile = build_profile(df)
+                ids, vectors = [], []
+                for col in df.columns:
+                    vector, signature, n_unique = column_fingerprint(col, df[col])
+                    entry_id = self.next_id
+                    self.next_id += 1
+                    self.entries[entry_id] = {
+                        "dataset": dataset,
+                        "column": str(col),
+                        "kind": _kind(df[col]),
+                        "profile": profile["columns"][str(col)],
+                        "decisions": None,
+                        "vector": vector,
+                        "signature": signature,
+                        "n_unique": n_unique,
+                        "unique_ratio": _unique_ratio(df[col], n_unique),
+                    }
+                    ids.append(entry_id)
+                    vectors.append(vector)
+
+            if ids:
+                self.index.add_with_ids(np.vstack(vectors), np.asarray(ids, dtype=np.int64))
+            self.datasets[dataset] = content
+            if save:
+                self.save()
+        return len(ids)
+
+    def _remove(self, dataset: str):
+        ids = [i for i, e in self.entries.items() if e["dataset"] == dataset]
+        if ids:
+            self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+            for i in ids:
+                del self.entries[i]
+        self.datasets.pop(dataset, None)
+
+    def remove_dataset(self, dataset: str, save: bool = True):
+        with self._lock:
+            self._remove(dataset)
+            if save:
+                self.save()
+
+    def record_decisions(self, dataset: str, decisions: Dict[str, Dict], save: bool = True):
+        """Remember the preprocessing chosen for a dataset's columns (see column_decisions)."""
+        with self._lock:
+            for entry in self.entries.values():
+                if entry["dataset"] == dataset and entry["column"] in decisions:
+                    entry["decisions"] = decisions[entry["column"]]
+            if save:
+                self.save()
+
+    # ---------- lookups ----------
+    def _public(self, entry: Dict, **extra) -> Dict:
+        out = {k: entry[k] for k in ("dataset", "column", "kind", "profile", "decisions")}
+        out.update(extra)
+        return out
+
+    def _dataset_entries(self, dataset: str) -> List[Dict]:
+        """Stored entries of one indexed dataset, in column order."""
+        with self._lock:
+            return [self.entries[i] for i in sorted(self.entries) if self.entries[i]["dataset"] == dataset]
+
+    def _search(self, columns: List[str], queries: np.ndarray, k: int, exclude_dataset: Optional[str],
+                min_score: float) -> Dict[str, List[Dict]]:
+        if not self.entries or not columns:
+            return {c: [] for c in columns}
+        with self._lock, span("column_index.search", columns=len(queries)):
+            # over-fetch so matches from the excluded dataset can be dropped
+            n_own = sum(e["dataset"] == exclude_dataset for e in self.entries.values())
+            scores, ids = self.index.search(queries, min(k + n_own, self.index.ntotal))
+
+            out = {}
+            for col, row_scores, row_ids in zip(columns, scores, ids):
+                matches = []
+                for score, i in zip(row_scores, row_ids):
+                    entry = self.entries.get(int(i))
+                    if entry is None or entry["dataset"] == exclude_dataset or score < min_score:
+                        continue
+                    matches.append(self._public(entry, score=round(float(score), 4)))
+                    if len(matches) == k:
+                        break
+                out[col] = matches
+        return out
+
+    def similar_columns(self, df, k: int = 5, exclude_dataset: Optional[str] = None,
+                        min_score: float = 0.6) -> Dict[str, List[Dict]]:
+        """For every column of df, the k most similar indexed columns from other datasets."""
+        if hasattr(df, "to_pandas"):
+            df = df.to_pandas()
+        if not self.entries or df.shape[1] == 0:
+            return {str(c): [] for c in df.columns}
+        queries = np.vstack([column_fingerprint(c, df[c])[0] for c in df.columns])
+        return self._search([str(c) for c in df.columns], queries, k, exclude_dataset, min_score)
+
+    def _joins(self, sources: List[Dict], exclude_dataset: Optional[str], min_containment: float) -> List[Dict]:
+        """sources: column, signature, n_unique, unique_ratio of the query columns."""
+        with self._lock:
+            keyed = [(i, e) for i, e in self.entries.items()
+                     if e["signature"] is not None and e["dataset"] != exclude_dataset]
+            if not keyed:
+                return []
+            sigs = np.vstack([e["signature"] for _, e in keyed])
+            sizes = np.array([e["n_unique"] for _, e in keyed], dtype=float)
+            unique = np.array([e["unique_ratio"] >= KEY_UNIQUE_RATIO for _, e in keyed])
+
+            found = []
+            for source in sources:
+                signature, n_unique = source["signature"], source["n_unique"]
+                if signature is None:
+                    continue
+                source_unique = source["unique_ratio"] >= KEY_UNIQUE_RATIO
+                jaccard = (sigs == signature).mean(axis=1)
+                # |A & B| = J / (1 + J) * (|A| + |B|); containment is relative to the smaller set
+                overlap = jaccard / (1 + jaccard) * (n_unique + sizes)
+                containment = overlap / np.minimum(n_unique, sizes)
+                for j in np.flatnonzero((containment >= min_containment) & (jaccard >= MIN_JOIN_JACCARD)
+                                           & (unique | source_unique)):
+                    found.append(self._public(
+                        keyed[j][1], source_column=source["column"],
+                        jaccard=round(float(jaccard[j]), 4),
+                        containment=round(float(min(containment[j], 1.0)), 4),
+                    ))
+        return sorted(found, key=lambda m: (-m["containment"], -m["jaccard"]))
+
+    def join_candidates(self, df, exclude_dataset: Optional[str] = None,
+                        min_containment: float = 0.8) -> List[Dict]:
+        """
+        Pairs of (df column, indexed column) where one side is unique (a
+        primary key) and the smaller value set is largely contained in the
+        other, estimated from MinHash signatures.
+        """
+        if hasattr(df, "to_pandas"):
+            df = df.to_pandas()
+        sources = []
+        for col in df.columns:
+            _, signature, n_unique = column_fingerprint(col, df[col])
+            sources.append({"column": str(col), "signature": signature, "n_unique": n_unique,
+                            "unique_ratio": _unique_ratio(df[col], n_unique)})
+        return self._joins(sources, exclude_dataset, min_containment)
+
+    def related_columns(self, dataset: str, k: int = 5, min_score: float = 0.6,
+                        min_containment: float = 0.8) -> Dict:
+        """
+        similar_columns and join_candidates for an already indexed dataset,
+        from its stored fingerprints: nothing is recomputed, so pages can call
+        this on every rerun. Other datasets only.
+        """
+        entries = self._dataset_entries(dataset)
+        columns = [e["column"] for e in entries]
+        similar = self._search(columns, np.vstack([e["vector"] for e in entries]) if entries else None,
+                               k, dataset, min_score)
+        joins = self._joins(entries, dataset, min_containment)
+        return {"similar": similar, "joins": joins}
+
+
+_INDEX: Optional[ColumnIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_column_index() -> ColumnIndex:
+    """Process-wide index shared by all Streamlit sessions."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = ColumnIndex()
+        return _INDEX
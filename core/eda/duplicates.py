@@ -0,0 +1,213 @@
+"""
+Exact and near-duplicate row detection.
+
+Exact: every row is hashed in one vectorized pass (polars hash_rows, pandas
+hashing as fallback); rows sharing a hash are confirmed with a real equality
+check, so hash collisions never produce false duplicates.
+
+Near: each row becomes the set of "column=normalized value" tokens (strings
+case/whitespace-folded, numbers rounded to a few significant digits). Two
+rows are near-duplicates when at least `threshold` of their columns match
+after normalization. MinHash signatures estimate the Jaccard similarity of
+the token sets (J = s / (2 - s) for a matching-column fraction s) and LSH
+banding only compares rows that share a band bucket, so cost grows with the
+number of rows and bucket sizes rather than with all pairs. Every pair in a
+bucket is then confirmed with its exact matching-column fraction, and
+clusters are formed around leader rows (not by transitive closure), so a
+dropped row is always a near-duplicate of the row that is kept.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import polars as pl
+except:
+    pl = None
+
+from core.utils.logger import span
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """One uint64 hash per row."""
+    if pl is not None:
+        try:
+            return pl.from_pandas(df.reset_index(drop=True)).hash_rows(seed=0).to_numpy()
+        except Exception:
+            pass  # e.g. mixed-type object columns polars can't convert
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _groups_from_keys(keys: np.ndarray) -> List[np.ndarray]:
+    """Positions grouped by equal key, only groups with more than one member."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+    multi = sizes > 1
+    return [order[s:s + n] for s, n in zip(starts[multi], sizes[multi])]
+
+
+def exact_duplicate_groups(df: pd.DataFrame) -> List[np.ndarray]:
+    """Groups of row positions whose rows are identical."""
+    with span("duplicates.hash_rows"):
+        candidates = _groups_from_keys(row_hashes(df))
+    if not candidates:
+        return []
+
+    # confirm against each bucket's first row so a hash collision can never report a false duplicate
+    with span("duplicates.verify"):
+        members = np.concatenate(candidates)
+        reps = np.repeat([g[0] for g in candidates], [len(g) for g in candidates])
+        same = (df.iloc[members].astype(str).to_numpy() == df.iloc[reps].astype(str).to_numpy()).all(axis=1)
+        # rows that differ from their bucket's first row get a unique key and drop out
+        keys = np.where(same, reps, -1 - members)
+    return [np.sort(members[g]) for g in _groups_from_keys(keys)]
+
+
+def _token_hashes(df: pd.DataFrame, significant_digits: int) -> np.ndarray:
+    """(n_rows, n_cols) uint64 hashes of normalized values, salted per column."""
+    columns = []
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            # round to significant digits so 10.001 and 10.0 become the same token
+            x = s.to_numpy(dtype=float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mag = 10.0 ** (np.floor(np.log10(np.abs(x))) - (significant_digits - 1))
+                values = np.where((x == 0) | ~np.isfinite(mag), x, np.round(x / mag) * mag)
+        else:
+            values = s.astype(str).str.strip().str.lower().to_numpy(dtype=object)
+        salt = pd.util.hash_array(np.array([str(col)], dtype=object))[0]
+        # the salt keeps equal values in different columns from being the same token
+        columns.append(pd.util.hash_array(values) ^ salt)
+    return np.column_stack(columns)
+
+
+def minhash_signatures(tokens: np.ndarray, num_perm: int = 32, seed: int = 0) -> np.ndarray:
+    """(n_rows, num_perm) MinHash signatures of each row's token set."""
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 2 ** 63 - 1, size=num_perm, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+    b = rng.randint(0, 2 ** 63 - 1, size=num_perm, dtype=np.int64).astype(np.uint64)
+    sig = np.empty((len(tokens), num_perm), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for k in range(num_perm):
+            # multiply-add hashing mod 2^64 is a cheap universal family for MinHash
+            sig[:, k] = (tokens * a[k] + b[k]).min(axis=1)
+    return sig
+
+
+def _bucket_pairs(keys: np.ndarray, max_bucket: int):
+    """
+    Yield (i, j) position arrays covering every pair of rows that share a key.
+    Oversized buckets are split into blocks of max_bucket rows so cost stays
+    bounded; a pair split across blocks can still meet in another band.
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    new_bucket = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+    starts = np.flatnonzero(new_bucket)
+    sizes = np.diff(np.r_[starts, len(keys)])
+    rank = np.arange(len(keys)) - np.repeat(starts, sizes)
+    block = np.cumsum(new_bucket | (rank % max_bucket == 0))
+    # offset d pairs each row with the row d places later in the same block
+    for d in range(1, min(max_bucket, int(sizes.max()))):
+        same = block[:-d] == block[d:]
+        if same.any():
+            yield order[:-d][same], order[d:][same]
+
+
+def _leaders(n: int, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Greedy leader clustering over verified links: in position order, a row
+    joins the earliest leader it is directly linked to, otherwise it leads a
+    new cluster. Every member therefore meets the threshold against its
+    leader; links are never followed transitively, so chains don't merge.
+    """
+    # each link once, as (later row, earlier row), sorted so a row's candidates come earliest first
+    later, earlier = np.maximum(i, j), np.minimum(i, j)
+    links = np.unique(later.astype(np.int64) * n + earlier)
+    later, earlier = (links // n).tolist(), (links % n).tolist()
+    # rows are final before any later row looks at them, since links are processed in row order
+    leader = list(range(n))
+    is_leader = bytearray(b"\x01") * n
+    for row, prev in zip(later, earlier):
+        if is_leader[row] and is_leader[prev]:
+            leader[row] = prev
+            is_leader[row] = 0
+    return np.asarray(leader)
+
+
+def near_duplicate_clusters(df: pd.DataFrame, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                            significant_digits: int = 3, seed: int = 0, max_bucket: int = 64) -> List[np.ndarray]:
+    """
+    Clusters of row positions; the first row of each cluster is its leader and
+    every other member agrees with it on at least `threshold` of the columns
+    (after normalization). With 16 bands of 4 a pair at the
+    default 0.8 (token Jaccard 0.67) becomes a candidate with ~97% probability.
+    """
+    if len(df) < 2 or df.shape[1] == 0:
+        return []
+    rows_per_band = num_perm // bands
+    with span("duplicates.minhash"):
+        tokens = _token_hashes(df, significant_digits)
+        sig = minhash_signatures(tokens, bands * rows_per_band, seed)
+
+    edges_i, edges_j = [], []
+    with span("duplicates.lsh"):
+        for band in range(bands):
+            block = np.ascontiguousarray(sig[:, band * rows_per_band:(band + 1) * rows_per_band])
+            keys = pd.util.hash_pandas_object(pd.DataFrame(block), index=False).to_numpy()
+            for i, j in _bucket_pairs(keys, max_bucket):
+                # tokens are one per column, so the matching fraction is a direct comparison
+                similar = (tokens[i] == tokens[j]).mean(axis=1) >= threshold
+                edges_i.append(i[similar])
+                edges_j.append(j[similar])
+
+    if not edges_i:
+        return []
+    with span("duplicates.leaders"):
+        labels = _leaders(len(df), np.concatenate(edges_i), np.concatenate(edges_j))
+    return [np.sort(g) for g in _groups_from_keys(labels)]
+
+
+def find_duplicates(df: pd.DataFrame, near: bool = True, threshold: float = 0.8,
+                    max_groups: Optional[int] = 20) -> Dict:
+    """
+    Duplicate report for analyze_dataframe. Near-duplicates are searched among
+    distinct rows only, so exact copies are not reported twice.
+    Row ids in the report are index labels of df.
+    """
+    exact = exact_duplicate_groups(df)
+    redundant = np.concatenate([g[1:] for g in exact]) if exact else np.array([], dtype=int)
+
+    report = {
+        "exact_duplicate_rows": int(len(redundant)),
+        "exact_groups": [df.index[g].tolist() for g in exact[:max_groups]],
+        "near_duplicate_rows": 0,
+        "near_clusters": [],
+    }
+
+    if near:
+        keep = np.setdiff1d(np.arange(len(df)), redundant)
+        clusters = near_duplicate_clusters(df.iloc[keep], threshold=threshold)
+        clusters = [keep[c] for c in clusters]
+        report["near_duplicate_rows"] = int(sum(len(c) - 1 for c in clusters))
+        report["near_clusters"] = [df.index[c].tolist() for c in clusters[:max_groups]]
+
+    return report
+
+
+def drop_duplicate_rows(df: pd.DataFrame, mode: str = "exact", threshold: float = 0.8) -> pd.DataFrame:
+    """Keep the first row of every exact ("exact") or exact + near ("near") duplicate group."""
+    groups = exact_duplicate_groups(df)
+    drop = [g[1:] for g in groups]
+    if mode == "near":
+        keep = np.setdiff1d(np.arange(len(df)), np.concatenate(drop) if drop else [])
+        drop += [keep[c][1:] for c in near_duplicate_clusters(df.iloc[keep], threshold=threshold)]
+    if not drop:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    mask[np.concatenate(drop)] = False
+    return df.iloc[mask]
@@ -1,10 +1,31 @@
-import matplotlib.pyplot as plt
+import os
+import tempfile
+
 import seaborn as sns
 from fpdf import FPDF
+from matplotlib.figure import Figure
 import pandas as pd
+
+from core.utils.logger import span, traced
+from core.utils.helpers import report_progress
+from .association import categorical_association
 print("DEBUG: report.py loaded")
 
-def generate_visual_eda_report(df: pd.DataFrame, path="eda_report.pdf"):
+def _save_figure(fig: Figure, path: str) -> str:
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+
+@traced("generate_visual_eda_report")
+def generate_visual_eda_report(df: pd.DataFrame, path="eda_report.pdf", progress=None):
+    # runs on shared job threads: draw on standalone Figures (no pyplot global state)
+    # and keep images in a private temp dir so concurrent reports can't overwrite them
+    with tempfile.TemporaryDirectory(prefix="eda_report_") as img_dir:
+        return _build_report(df, path, img_dir, progress)
+
+
+def _build_report(df: pd.DataFrame, path: str, img_dir: str, progress=None):
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
 
@@ -31,33 +52,58 @@ def generate_visual_eda_report(df: pd.DataFrame, path="eda_report.pdf"):
     # NUMERIC DISTRIBUTIONS
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns.tolist()
 
-    for col in numeric_cols:
-        plt.figure(figsize=(6, 4))
-        sns.histplot(df[col].dropna(), kde=True)
-        plt.title(f"Distribution of {col}")
-        plt.tight_layout()
-        img_path = f"temp_{col}.png"
-        plt.savefig(img_path)
-        plt.close()
+    n_steps = len(numeric_cols) + 3
+    for i, col in enumerate(numeric_cols):
+        report_progress(progress, i / n_steps, f"histogram: {col}")
+        with span("report.histogram"):
+            fig = Figure(figsize=(6, 4))
+            ax = fig.subplots()
+            sns.histplot(df[col].dropna(), kde=True, ax=ax)
+            ax.set_title(f"Distribution of {col}")
+            img_path = _save_figure(fig, os.path.join(img_dir, f"hist_{i}.png"))
 
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 16)
-        pdf.cell(0, 10, f"Distribution: {col}", ln=True)
-        pdf.image(img_path, x=10, w=180)
+        with span("report.add_page"):
+            pdf.add_page()
+            pdf.set_font("Arial", "B", 16)
+            pdf.cell(0, 10, f"Distribution: {col}", ln=True)
+            pdf.image(img_path, x=10, w=180)
 
     # CORRELATION MATRIX
     if len(numeric_cols) > 1:
-        plt.figure(figsize=(6, 5))
-        sns.heatmap(df[numeric_cols].corr(), cmap="coolwarm")
-        plt.title("Correlation Matrix")
-        plt.tight_layout()
-        plt.savefig("corr.png")
-        plt.close()
-
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 16)
-        pdf.cell(0, 10, "Correlation Heatmap", ln=True)
-        pdf.image("corr.png", x=10, w=180)
-
-    pdf.output(path)
+        report_progress(progress, len(numeric_cols) / n_steps, "correlation heatmap")
+        with span("report.correlation"):
+            fig = Figure(figsize=(6, 5))
+            ax = fig.subplots()
+            sns.heatmap(df[numeric_cols].corr(), cmap="coolwarm", ax=ax)
+            ax.set_title("Correlation Matrix")
+            corr_path = _save_figure(fig, os.path.join(img_dir, "corr.png"))
+
+        with span("report.add_page"):
+            pdf.add_page()
+            pdf.set_font("Arial", "B", 16)
+            pdf.cell(0, 10, "Correlation Heatmap", ln=True)
+            pdf.image(corr_path, x=10, w=180)
+
+    # CATEGORICAL ASSOCIATION
+    categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    if len(categorical_cols) > 1:
+        report_progress(progress, (n_steps - 2) / n_steps, "categorical association")
+        with span("report.association"):
+            cramers = categorical_association(df, categorical_cols)["cramers_v"]
+            fig = Figure(figsize=(6, 5))
+            ax = fig.subplots()
+            sns.heatmap(cramers, cmap="viridis", vmin=0, vmax=1, ax=ax)
+            ax.set_title("Categorical Association (Cramér's V)")
+            assoc_path = _save_figure(fig, os.path.join(img_dir, "assoc.png"))
+
+        with span("report.add_page"):
+            pdf.add_page()
+            pdf.set_font("Arial", "B", 16)
+            pdf.cell(0, 10, "Categorical Association (Cramer's V)", ln=True)
+            pdf.image(assoc_path, x=10, w=180)
+
+    report_progress(progress, (n_steps - 1) / n_steps, "writing PDF")
+    with span("report.pdf_output"):
+        pdf.output(path)
+    report_progress(progress, 1.0, "report done")
     return path
@@ -1,23 +1,29 @@
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 print("DEBUG: visualize.py loaded")
 
+# plots build standalone Figures instead of using pyplot's global current figure,
+# so page reruns and background report jobs can draw at the same time
+
+
 def plot_numeric_distribution(df, col):
-    plt.figure(figsize=(6, 4))
-    sns.histplot(df[col].dropna(), kde=True)
-    plt.title(f"Distribution of {col}")
-    plt.tight_layout()
-    return plt.gcf()
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
+    sns.histplot(df[col].dropna(), kde=True, ax=ax)
+    ax.set_title(f"Distribution of {col}")
+    fig.tight_layout()
+    return fig
 
 
 def plot_categorical_distribution(df, col):
-    plt.figure(figsize=(6, 4))
-    df[col].value_counts().plot(kind="bar")
-    plt.title(f"Frequency of {col}")
-    plt.tight_layout()
-    return plt.gcf()
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
+    df[col].value_counts().plot(kind="bar", ax=ax)
+    ax.set_title(f"Frequency of {col}")
+    fig.tight_layout()
+    return fig
 
 
 def plot_correlation_heatmap(df, cols=None):
@@ -32,9 +38,28 @@ def plot_correlation_heatmap(df, cols=None):
     if len(cols) < 2:
         raise ValueError("Need at least 2 numeric columns for correlation heatmap.")
 
-    plt.figure(figsize=(8, 6))
-    sns.heatmap(df[cols].corr(), annot=False, cmap="coolwarm")
-    plt.title("Correlation Matrix")
-    plt.tight_layout()
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    sns.heatmap(df[cols].corr(), annot=False, cmap="coolwarm", ax=ax)
+    ax.set_title("Correlation Matrix")
+    fig.tight_layout()
+
+    return fig
+
+
+def plot_association_heatmap(matrix, title="Categorical Association (Cramér's V)"):
+    """
+    matrix: square DataFrame (or dict-of-dicts) from core.eda.association
+    """
+    matrix = pd.DataFrame(matrix)
+
+    if matrix.shape[0] < 2:
+        raise ValueError("Need at least 2 categorical columns for association heatmap.")
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    sns.heatmap(matrix, annot=False, cmap="viridis", vmin=0, vmax=1, ax=ax)
+    ax.set_title(title)
+    fig.tight_layout()
 
-    return plt.gcf()
+    return fig
@@ -0,0 +1,111 @@
+"""
+Pluggable text-generation backends for the insights engine.
+
+Every task is a Prompt: the text sent to a model plus a deterministic
+template answer built from the same profile. The "stub" backend returns the
+template (the default, used in tests and whenever no local model is
+configured); the "transformers" backend runs a seq2seq model from a local
+directory, never downloading one implicitly. complete() sends all uncached prompts to
+the backend in a single generate() call and caches each answer on disk by
+(backend, task, profile hash), so re-opening a page costs nothing.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from core.utils.config import get_settings
+from core.utils.logger import span
+
+CACHE_DIR = Path(get_settings()["paths"]["cache_dir"]) / "nlp"
+
+
+class Prompt(NamedTuple):
+    text: str
+    template: str
+
+
+class StubBackend:
+    """Deterministic backend: answers every prompt with its template."""
+    name = "stub"
+
+    def generate(self, prompts: List[Prompt]) -> List[str]:
+        return [p.template for p in prompts]
+
+
+@lru_cache(maxsize=2)
+def _load_pipeline(model: str):
+    from transformers import pipeline  # heavy import, only when a model is actually used
+    # local files only: a missing model should fail fast, not start a hub download
+    return pipeline("text2text-generation", model=model, model_kwargs={"local_files_only": True})
+
+
+class TransformersBackend:
+    """Local Hugging Face seq2seq model; the whole batch goes through one pipeline call."""
+    def __init__(self, model: str, max_new_tokens: int = 256):
+        self.model = model
+        self.max_new_tokens = max_new_tokens
+        self.name = f"transformers:{model}"
+
+    def generate(self, prompts: List[Prompt]) -> List[str]:
+        pipe = _load_pipeline(self.model)
+        outputs = pipe(
+            [p.text for p in prompts],
+            max_new_tokens=self.max_new_tokens,
+            batch_size=len(prompts),
+            truncation=True,
+        )
+        return [out[0]["generated_text"].strip() if isinstance(out, list) else out["generated_text"].strip()
+                for out in outputs]
+
+
+def get_backend(name: Optional[str] = None, settings: Optional[Dict] = None):
+    """
+    Backend from config.toml [nlp]: "stub", "transformers" or "auto"
+    (transformers only if it is installed and `model` is a local model
+    directory, otherwise the stub).
+    """
+    settings = settings or get_settings()["nlp"]
+    name = name or settings["backend"]
+    model = settings.get("model") or ""
+    if name == "auto":
+        local = bool(model) and os.path.isdir(model)
+        name = "transformers" if local and importlib.util.find_spec("transformers") else "stub"
+    if name == "stub":
+        return StubBackend()
+    if name == "transformers":
+        if not model:
+            raise ValueError("nlp backend 'transformers' needs [nlp] model set to a local model directory")
+        return TransformersBackend(model, settings["max_new_tokens"])
+    raise ValueError(f"Unknown nlp backend: {name}")
+
+
+def _cache_path(backend, task: str, key: str) -> Path:
+    digest = hashlib.sha1(f"{backend.name}\x00{task}\x00{key}".encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def complete(prompts: Dict[str, Prompt], key: str, backend=None, use_cache: bool = True) -> Dict[str, str]:
+    """Answers for {task: Prompt}, generated in one backend call and cached by key (profile hash)."""
+    backend = backend or get_backend()
+    answers, missing = {}, []
+    for task in prompts:
+        path = _cache_path(backend, task, key)
+        if use_cache and path.exists():
+            answers[task] = json.loads(path.read_text(encoding="utf-8"))["text"]
+        else:
+            missing.append(task)
+
+    if missing:
+        with span("nlp.generate", backend=backend.name, prompts=len(missing)):
+            texts = backend.generate([prompts[t] for t in missing])
+        for task, text in zip(missing, texts):
+            answers[task] = text
+            if use_cache:
+                path = _cache_path(backend, task, key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps({"task": task, "text": text}), encoding="utf-8")
+    return answers
@@ -0,0 +1,66 @@
+"""
+Column explanations. All columns go into a single prompt (one model call);
+the answer is parsed line by line and any column the model skipped falls
+back to its template explanation.
+"""
+from typing import Dict
+
+from .backends import Prompt, complete
+from .profile import describe_column, ensure_profile, profile_hash
+
+TASK = "explain_columns"
+
+
+def template_explanation(name: str, info: Dict, rows: int) -> str:
+    kind = info.get("kind")
+    if info["n_unique"] <= 1:
+        text = "Constant column; it carries no information."
+    elif kind == "numeric" and info["n_unique"] == 2:
+        text = f"Binary numeric flag taking values {info['min']:g} and {info['max']:g}."
+    elif kind == "numeric" and info.get("min") is not None:
+        text = f"Numeric measure ranging from {info['min']:g} to {info['max']:g} (mean {info['mean']:g})."
+    elif kind == "datetime":
+        text = f"Timestamp spanning {info['min']} to {info['max']}."
+    elif info["n_unique"] == rows:
+        text = "Identifier-like text; every value is unique."
+    elif info.get("top"):
+        text = f"Categorical field with {info['n_unique']} distinct values, most often '{info['top'][0]}'."
+    else:
+        text = "Column with no non-missing values."
+    if info["missing"]:
+        text += f" {info['missing']:.0%} of values are missing."
+    return text
+
+
+def build_prompt(profile: Dict) -> Prompt:
+    columns = profile["columns"]
+    lines = [f"- {name}: {describe_column(info)}" for name, info in columns.items()]
+    text = (
+        "Explain in one short sentence what each column of this dataset most likely contains. "
+        "Answer with one line per column in the form `name: explanation`.\n"
+        + "\n".join(lines)
+    )
+    template = "\n".join(
+        f"{name}: {template_explanation(name, info, profile['rows'])}" for name, info in columns.items()
+    )
+    return Prompt(text, template)
+
+
+def parse(text: str, profile: Dict) -> Dict[str, str]:
+    answered = {}
+    for line in text.splitlines():
+        name, sep, explanation = line.strip().lstrip("-*• ").partition(":")
+        name = name.strip().strip("`")
+        if sep and name in profile["columns"] and explanation.strip():
+            answered.setdefault(name, explanation.strip())
+    return {
+        name: answered.get(name) or template_explanation(name, info, profile["rows"])
+        for name, info in profile["columns"].items()
+    }
+
+
+def explain_columns(data, backend=None, use_cache: bool = True) -> Dict[str, str]:
+    """{column: explanation} for a profile (see core.nlp.profile) or a frame."""
+    profile = ensure_profile(data)
+    answers = complete({TASK: build_prompt(profile)}, profile_hash(profile), backend, use_cache)
+    return parse(answers[TASK], profile)
@@ -0,0 +1,75 @@
+"""
+Observations and next steps for a dataset.
+
+Rule-based findings are computed from the profile first; the model only
+rewrites/prioritizes them, and they are the template answer when no model is
+used. generate_all() produces explanations, summary and insights with a
+single backend call.
+"""
+from typing import Dict, List
+
+from core.utils.helpers import report_progress
+
+from . import explain_columns as explain
+from . import summarize
+from .backends import Prompt, complete
+from .profile import ensure_profile, profile_hash
+
+TASK = "generate_insights"
+
+
+def find_observations(profile: Dict) -> List[str]:
+    rows = profile["rows"]
+    found = []
+    for name, info in profile["columns"].items():
+        kind = info.get("kind")
+        if info["missing"] and info["missing"] >= 0.3:
+            found.append(f"'{name}' is {info['missing']:.0%} missing; consider dropping or imputing it.")
+        if info["n_unique"] <= 1:
+            found.append(f"'{name}' is constant and can be dropped.")
+        elif kind == "categorical" and rows > 1 and info["n_unique"] == rows:
+            found.append(f"'{name}' looks like an identifier; exclude it from model features.")
+        elif kind == "categorical" and info["n_unique"] > 50:
+            found.append(f"'{name}' has {info['n_unique']} categories; hashing or target encoding fits better than one-hot.")
+        elif kind == "categorical" and info.get("top_share") and info["top_share"] >= 0.95:
+            found.append(f"'{name}' is dominated by '{info['top'][0]}' ({info['top_share']:.0%} of rows).")
+        if kind == "numeric" and info.get("skew") is not None and abs(info["skew"]) > 2:
+            found.append(f"'{name}' is heavily skewed (skew {info['skew']:.1f}); a log or robust scaling may help.")
+    return found or ["No data quality issues stand out in the profile."]
+
+
+def build_prompt(profile: Dict) -> Prompt:
+    facts = find_observations(profile)
+    text = (
+        "You are reviewing a dataset before modelling. Rewrite these findings as a prioritized "
+        "bullet list of observations and recommended next steps.\n"
+        f"Rows: {profile['rows']}, columns: {len(profile['columns'])}\nFindings:\n"
+        + "\n".join(f"- {f}" for f in facts)
+    )
+    return Prompt(text, "\n".join(f"- {f}" for f in facts))
+
+
+def parse(text: str, profile: Dict) -> List[str]:
+    items = [line.strip().lstrip("-*• ").strip() for line in text.splitlines()]
+    return [i for i in items if i] or find_observations(profile)
+
+
+def generate_insights(data, backend=None, use_cache: bool = True) -> List[str]:
+    profile = ensure_profile(data)
+    answers = complete({TASK: build_prompt(profile)}, profile_hash(profile), backend, use_cache)
+    return parse(answers[TASK], profile)
+
+
+def generate_all(data, backend=None, use_cache: bool = True, progress=None) -> Dict:
+    """Column explanations, summary and insights from one (batched) backend call."""
+    report_progress(progress, 0.0, "generating insights")
+    profile = ensure_profile(data)
+    tasks = {
+        explain.TASK: (explain.build_prompt, explain.parse),
+        summarize.TASK: (summarize.build_prompt, summarize.parse),
+        TASK: (build_prompt, parse),
+    }
+    answers = complete({t: build(profile) for t, (build, _) in tasks.items()},
+                       profile_hash(profile), backend, use_cache)
+    report_progress(progress, 1.0, "insights done")
+    return {t: parse_fn(answers[t], profile) for t, (_, parse_fn) in tasks.items()}
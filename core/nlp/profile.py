@@ -0,0 +1,87 @@
+"""
+Compact dataset profile used by the insights engine.
+
+Prompts and templates are built from this profile instead of the raw frame,
+so model input stays small whatever the dataset size, and the profile hash is
+a stable cache key for generated text.
+"""
+import hashlib
+import json
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _num(x) -> Optional[float]:
+    x = float(x)
+    return round(x, 4) if np.isfinite(x) else None
+
+
+def build_profile(df, top_k: int = 3) -> Dict:
+    """Per-column dtype, missingness, cardinality, top values and numeric stats."""
+    if hasattr(df, "to_pandas"):
+        df = df.to_pandas()
+
+    n = len(df)
+    missing = df.isna().mean()
+    n_unique = df.nunique(dropna=True)
+
+    columns = {}
+    for col in df.columns:
+        s = df[col]
+        info = {
+            "dtype": str(s.dtype),
+            "missing": _num(missing[col]),
+            "n_unique": int(n_unique[col]),
+        }
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            values = s.dropna().to_numpy(dtype=float)
+            if len(values):
+                info.update({
+                    "kind": "numeric",
+                    "min": _num(values.min()),
+                    "max": _num(values.max()),
+                    "mean": _num(values.mean()),
+                    "std": _num(values.std()),
+                    "skew": _num(pd.Series(values).skew()) if len(values) > 2 else None,
+                })
+            else:
+                info["kind"] = "numeric"
+        elif pd.api.types.is_datetime64_any_dtype(s):
+            info.update({"kind": "datetime", "min": str(s.min()), "max": str(s.max())})
+        else:
+            counts = s.value_counts(dropna=True).head(top_k)
+            info.update({
+                "kind": "categorical",
+                "top": [str(v) for v in counts.index],
+                "top_share": _num(counts.iloc[0] / n) if len(counts) and n else None,
+            })
+        columns[str(col)] = info
+
+    return {"rows": int(n), "columns": columns}
+
+
+def ensure_profile(data, top_k: int = 3) -> Dict:
+    """Accept either a profile or a (pandas/polars) frame."""
+    return data if isinstance(data, dict) else build_profile(data, top_k)
+
+
+def profile_hash(profile: Dict) -> str:
+    payload = json.dumps(profile, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def describe_column(info: Dict) -> str:
+    """One short line of facts about a column, for prompts and templates."""
+    parts = [info["dtype"]]
+    if info["missing"]:
+        parts.append(f"{info['missing']:.0%} missing")
+    parts.append(f"{info['n_unique']} unique")
+    if info.get("kind") == "numeric" and info.get("min") is not None:
+        parts.append(f"range {info['min']:g} to {info['max']:g}, mean {info['mean']:g}")
+    elif info.get("kind") == "datetime":
+        parts.append(f"from {info['min']} to {info['max']}")
+    elif info.get("top"):
+        parts.append("e.g. " + ", ".join(info["top"]))
+    return "; ".join(parts)
@@ -0,0 +1,46 @@
+"""
+Short natural-language summary of a dataset profile.
+"""
+from typing import Dict
+
+from .backends import Prompt, complete
+from .profile import describe_column, ensure_profile, profile_hash
+
+TASK = "summarize_dataset"
+
+
+def template_summary(profile: Dict) -> str:
+    columns = profile["columns"]
+    kinds = {}
+    for info in columns.values():
+        kinds[info.get("kind", "other")] = kinds.get(info.get("kind", "other"), 0) + 1
+    kind_text = ", ".join(f"{count} {kind}" for kind, count in sorted(kinds.items()))
+
+    text = f"The dataset has {profile['rows']} rows and {len(columns)} columns ({kind_text})."
+    incomplete = {name: info["missing"] for name, info in columns.items() if info["missing"]}
+    if incomplete:
+        worst = max(incomplete, key=incomplete.get)
+        text += (f" {len(incomplete)} columns have missing values, "
+                 f"the most in '{worst}' ({incomplete[worst]:.0%}).")
+    else:
+        text += " There are no missing values."
+    return text
+
+
+def build_prompt(profile: Dict) -> Prompt:
+    lines = [f"- {name}: {describe_column(info)}" for name, info in profile["columns"].items()]
+    text = (
+        "Summarize this dataset in two or three sentences for a data analyst.\n"
+        f"Rows: {profile['rows']}\nColumns:\n" + "\n".join(lines)
+    )
+    return Prompt(text, template_summary(profile))
+
+
+def parse(text: str, profile: Dict) -> str:
+    return text.strip() or template_summary(profile)
+
+
+def summarize_dataset(data, backend=None, use_cache: bool = True) -> str:
+    profile = ensure_profile(data)
+    answers = complete({TASK: build_prompt(profile)}, profile_hash(profile), backend, use_cache)
+    return parse(answers[TASK], profile)
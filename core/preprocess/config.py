@@ -9,4 +9,12 @@ DEFAULT_CONFIG = {
     "leakage_corr_threshold": 0.95,  # perfect or near-perfect correlation
     "leakage_mi_threshold": 0.6,     # mutual info threshold (heuristic)
     "max_unique_for_onehot": 20,     # if categorical unique < this -> one-hot
+    "hash_n_features": 32,           # hashing width for high-cardinality columns
+    "target_encode_folds": 5,        # out-of-fold splits for target encoding
+    "target_encode_smoothing": 10.0, # pull rare categories towards the global mean
+    "dedupe": None,                  # None | "exact" | "near": drop duplicate rows before fitting
+    "dedupe_threshold": 0.8,         # "near" dedupe: min fraction of columns matching the kept row
+    "drift_bins": 10,                # quantile bins per numeric feature in the drift reference
+    "profile": False,                # per-step timings in summary["profile"]
+    "profile_memory": True,          # also track peak memory (tracemalloc) when profiling
 }
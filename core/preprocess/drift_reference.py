@@ -0,0 +1,148 @@
+"""
+Training-time reference sketches for drift monitoring (see core/deploy/drift.py).
+
+    numeric      quantile bin edges + training share per bin, then missing
+    categorical  kept categories + training share of each, then "other" and missing
+
+With the raw training frame the bins are empirical. Without it they are
+rebuilt from what the fitted pipeline already holds: the scaler's
+location/scale (normal or uniform bins) and RareCategoryMerger's kept
+categories, frequencies and missing share. The scaler never sees missing
+values, so scaler-based sketches carry "missing_known": False and the
+monitor leaves their missing bucket out of the scores.
+"""
+import json
+from statistics import NormalDist
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+
+from .rare_category import RareCategoryMerger
+from .transformers import TimedStep
+
+# high-cardinality columns keep their most frequent values (from data) as reference bins
+TOP_K_HIGH_CARD = 20
+
+
+def _unwrap(step):
+    return step.estimator if isinstance(step, TimedStep) else step
+
+
+def _branches(pipeline) -> Dict[str, tuple]:
+    """{branch name: (fitted sub-pipeline, columns)} of the ColumnTransformer step."""
+    column_tf = _unwrap(pipeline.named_steps["preproc"])
+    return {name: (pipe, list(cols)) for name, pipe, cols in column_tf.transformers_
+            if name != "remainder" and len(cols)}
+
+
+def _numeric_from_data(x: pd.Series, n_bins: int) -> Dict:
+    values = pd.to_numeric(x, errors="coerce").to_numpy(dtype=float)
+    valid = values[~np.isnan(values)]
+    edges = np.unique(np.quantile(valid, np.linspace(0, 1, n_bins + 1)[1:-1])) if len(valid) else np.array([])
+    counts = np.bincount(np.searchsorted(edges, valid, side="right"), minlength=len(edges) + 1)
+    expected = np.r_[counts, len(values) - len(valid)] / max(len(values), 1)
+    return {"edges": edges.tolist(), "expected": expected.tolist(), "source": "data"}
+
+
+def _scaler_columns(steps: Dict, cols: List) -> List[str]:
+    """Input column behind each position of the scaler's fitted statistics."""
+    scaler = steps["scale"]
+    if hasattr(scaler, "feature_names_in_"):
+        return [str(c) for c in scaler.feature_names_in_]
+    if "impute" in steps:
+        # SimpleImputer drops all-NaN columns, which shifts every later position
+        imputer = steps["impute"]
+        names = imputer.get_feature_names_out(None if hasattr(imputer, "feature_names_in_") else [str(c) for c in cols])
+        return [str(c) for c in names]
+    return [str(c) for c in cols]
+
+
+def _numeric_from_scaler(scaler, i: int, n_bins: int) -> Optional[Dict]:
+    scaler = _unwrap(scaler)
+    q = np.linspace(0, 1, n_bins + 1)[1:-1]
+    if isinstance(scaler, StandardScaler) and scaler.with_mean:
+        mean, sigma = scaler.mean_[i], scaler.scale_[i]
+    elif isinstance(scaler, RobustScaler):
+        # IQR of a normal distribution is 1.349 sigma
+        mean, sigma = scaler.center_[i], scaler.scale_[i] / 1.349
+    elif isinstance(scaler, MinMaxScaler):
+        edges = scaler.data_min_[i] + q * scaler.data_range_[i]
+        return {"edges": edges.tolist(), "expected": [1 / n_bins] * n_bins + [0.0], "source": "scaler",
+                "missing_known": False}
+    else:
+        return None
+    if not sigma > 0:
+        return None
+    edges = np.unique([mean + sigma * NormalDist().inv_cdf(p) for p in q])
+    expected = np.diff(np.r_[0.0, [NormalDist(mean, sigma).cdf(e) for e in edges], 1.0])
+    return {"edges": edges.tolist(), "expected": np.r_[expected, 0.0].tolist(), "source": "scaler",
+            "missing_known": False}
+
+
+def _categorical_from_data(x: pd.Series, categories: Optional[List[str]]) -> Dict:
+    present = x.notna()
+    values = x[present].astype(str)
+    if categories is None:
+        categories = values.value_counts().head(TOP_K_HIGH_CARD).index.tolist()
+    share = values.value_counts().reindex(categories, fill_value=0).to_numpy() / max(len(x), 1)
+    missing = 1.0 - present.mean() if len(x) else 0.0
+    other = max(0.0, 1.0 - share.sum() - missing)
+    return {"categories": list(categories), "expected": np.r_[share, other, missing].tolist(), "source": "data"}
+
+
+def _categorical_from_merger(merger: RareCategoryMerger, col) -> Dict:
+    freqs = getattr(merger, "frequencies_", {}).get(col)
+    if freqs:
+        categories = [str(c) for c in freqs]
+        share = np.array(list(freqs.values()), dtype=float)
+    else:
+        # pickles from before frequencies_ existed: assume kept categories are equally common
+        categories = sorted(str(c) for c in merger.frequent_maps_[col])
+        share = np.full(len(categories), 1.0 / max(len(categories), 1))
+    other = max(0.0, 1.0 - share.sum())
+    missing = getattr(merger, "missing_shares_", {}).get(col)
+    if missing is None:
+        # pickles from before missing_shares_ existed
+        return {"categories": categories, "expected": np.r_[share, other, 0.0].tolist(),
+                "source": "rare_merger", "missing_known": False}
+    # frequencies are shares of non-missing values; rescale to shares of all rows
+    return {"categories": categories, "expected": np.r_[np.r_[share, other] * (1 - missing), missing].tolist(),
+            "source": "rare_merger"}
+
+
+def build_reference(pipeline, X: Optional[pd.DataFrame] = None, n_bins: int = 10) -> Dict:
+    """
+    Reference sketches for every input feature of a fitted preprocessing pipeline.
+    X (the raw training frame) gives empirical bins; without it the fitted
+    scaler and RareCategoryMerger statistics are used.
+    """
+    reference = {"n_bins": n_bins, "numeric": {}, "categorical": {}}
+    for name, (branch, cols) in _branches(pipeline).items():
+        steps = {k: _unwrap(v) for k, v in branch.named_steps.items()}
+        positions = {c: i for i, c in enumerate(_scaler_columns(steps, cols))} if "scale" in steps else {}
+        for col in cols:
+            key = str(col)
+            if name == "num":
+                if X is not None and col in X.columns:
+                    reference["numeric"][key] = _numeric_from_data(X[col], n_bins)
+                elif key in positions:
+                    # columns the imputer dropped (all-NaN in training) have no scaler stats
+                    sketch = _numeric_from_scaler(steps["scale"], positions[key], n_bins)
+                    if sketch is not None:
+                        reference["numeric"][key] = sketch
+            elif "rare" in steps and col in steps["rare"].frequent_maps_:
+                if X is not None and col in X.columns:
+                    categories = [str(c) for c in steps["rare"].frequent_maps_[col]]
+                    reference["categorical"][key] = _categorical_from_data(X[col], categories)
+                else:
+                    reference["categorical"][key] = _categorical_from_merger(steps["rare"], col)
+            elif X is not None and col in X.columns:
+                reference["categorical"][key] = _categorical_from_data(X[col], None)
+    return reference
+
+
+def load_reference(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
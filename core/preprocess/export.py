@@ -1,4 +1,5 @@
 from .utils import save_pipeline, save_json
+from .drift_reference import build_reference
 import pandas as pd
 from typing import Dict
 
@@ -6,9 +7,18 @@ def save_preprocess_artifacts(pipeline, processed_df: pd.DataFrame, summary: Dic
     pipeline_path = f"{out_dir}/preprocessor.pkl"
     data_path = f"{out_dir}/processed.csv"
     summary_path = f"{out_dir}/preprocess_summary.json"
+    reference_path = f"{out_dir}/drift_reference.json"
+
+    # the drift reference travels next to the pipeline; rebuild it from fitted stats if missing
+    summary = dict(summary)
+    reference = summary.pop("drift_reference", None)
+    if reference is None:
+        reference = build_reference(pipeline)
 
     save_pipeline(pipeline, pipeline_path)
     processed_df.to_csv(data_path, index=False)
     save_json(summary, summary_path)
+    save_json(reference, reference_path)
 
-    return {"pipeline": pipeline_path, "processed_data": data_path, "summary": summary_path}
+    return {"pipeline": pipeline_path, "processed_data": data_path, "summary": summary_path,
+            "drift_reference": reference_path}
@@ -0,0 +1,144 @@
+"""
+Bounded-width encoders for high-cardinality categoricals.
+Two strategies, both with an output width independent of the number of categories:
+1) out-of-fold target encoding (smoothed per-category target means).
+2) feature hashing of "column=value" tokens into a fixed number of buckets.
+"""
+from sklearn.base import BaseEstimator, TransformerMixin
+import pandas as pd
+import numpy as np
+
+
+def _is_discrete_target(y: pd.Series, max_classes: int = 20) -> bool:
+    # same heuristic as leakage.detect_leakage: non-numeric or few distinct values
+    if not pd.api.types.is_numeric_dtype(y) or pd.api.types.is_bool_dtype(y):
+        return True
+    return y.nunique(dropna=True) < max_classes
+
+
+class TargetEncoder(BaseEstimator, TransformerMixin):
+    """
+    Replace each category with the smoothed mean of the target for that category.
+
+    fit_transform() returns out-of-fold encodings (each row is encoded with
+    statistics computed without its own fold) so the training matrix does not
+    leak the target; transform() uses statistics fitted on the full data.
+    Discrete targets produce one column per class (or one column for binary).
+    """
+    def __init__(self, n_folds=5, smoothing=10.0, random_state=0):
+        self.n_folds = n_folds
+        self.smoothing = smoothing
+        self.random_state = random_state
+
+    def _target_matrix(self, y):
+        y = pd.Series(np.asarray(y)).reset_index(drop=True)
+        if _is_discrete_target(y):
+            self.classes_ = pd.unique(y.dropna())
+            codes = pd.Categorical(y, categories=self.classes_).codes
+            Y = np.zeros((len(y), len(self.classes_)), dtype=float)
+            known = codes >= 0
+            Y[np.flatnonzero(known), codes[known]] = 1.0
+            # binary: P(second class) is enough
+            if Y.shape[1] == 2:
+                Y = Y[:, 1:]
+        else:
+            self.classes_ = None
+            Y = y.astype(float).fillna(y.astype(float).mean()).to_numpy().reshape(-1, 1)
+        return Y
+
+    def _category_means(self, codes, n_cats, Y, train_idx, prior):
+        # vectorized group aggregates: per-category target sums and counts
+        tr_codes = codes[train_idx]
+        counts = np.bincount(tr_codes, minlength=n_cats).astype(float)
+        sums = np.column_stack([
+            np.bincount(tr_codes, weights=Y[train_idx, k], minlength=n_cats)
+            for k in range(Y.shape[1])
+        ])
+        return (sums + self.smoothing * prior) / (counts[:, None] + self.smoothing)
+
+    def _fit_stats(self, df, Y):
+        self.cols_ = list(df.columns)
+        self.prior_ = Y.mean(axis=0)
+        self.categories_ = {}
+        self.encodings_ = {}
+        codes_by_col = {}
+        all_idx = np.arange(len(df))
+        for col in self.cols_:
+            codes, uniques = pd.factorize(df[col].astype(str), sort=False)
+            self.categories_[col] = pd.Index(uniques)
+            codes_by_col[col] = codes
+            # full-data statistics, used by transform()
+            self.encodings_[col] = self._category_means(codes, len(uniques), Y, all_idx, self.prior_)
+        return codes_by_col
+
+    def fit(self, X, y=None):
+        if y is None:
+            raise ValueError("TargetEncoder requires a target (y).")
+        df = pd.DataFrame(X).reset_index(drop=True)
+        Y = self._target_matrix(y)
+        self._fit_stats(df, Y)
+        return self
+
+    def fit_transform(self, X, y=None, **fit_params):
+        if y is None:
+            raise ValueError("TargetEncoder requires a target (y).")
+        df = pd.DataFrame(X).reset_index(drop=True)
+        Y = self._target_matrix(y)
+        codes_by_col = self._fit_stats(df, Y)
+
+        n = len(df)
+        rng = np.random.RandomState(self.random_state)
+        folds = rng.permutation(n) % max(2, min(self.n_folds, n))
+        out = np.empty((n, len(self.cols_) * Y.shape[1]), dtype=float)
+        width = Y.shape[1]
+        for j, col in enumerate(self.cols_):
+            codes = codes_by_col[col]
+            n_cats = len(self.categories_[col])
+            for f in np.unique(folds):
+                apply_idx = np.flatnonzero(folds == f)
+                train_idx = np.flatnonzero(folds != f)
+                prior = Y[train_idx].mean(axis=0)
+                means = self._category_means(codes, n_cats, Y, train_idx, prior)
+                out[apply_idx, j * width:(j + 1) * width] = means[codes[apply_idx]]
+        return out
+
+    def transform(self, X):
+        df = pd.DataFrame(X).reset_index(drop=True)
+        blocks = []
+        for col in self.cols_:
+            codes = self.categories_[col].get_indexer(df[col].astype(str))
+            enc = self.encodings_[col]
+            # unseen categories fall back to the global prior
+            table = np.vstack([enc, self.prior_[None, :]])
+            blocks.append(table[codes])  # code -1 picks the prior row
+        return np.hstack(blocks)
+
+
+class HashingEncoder(BaseEstimator, TransformerMixin):
+    """
+    Hash "column=value" tokens of all input columns into n_features buckets.
+    Output width is fixed regardless of cardinality; unseen values need no refit.
+    """
+    def __init__(self, n_features=32, alternate_sign=True):
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+
+    def fit(self, X, y=None):
+        self.cols_ = list(pd.DataFrame(X).columns)
+        return self
+
+    def transform(self, X):
+        df = pd.DataFrame(X).reset_index(drop=True)
+        n = len(df)
+        out = np.zeros((n, self.n_features), dtype=float)
+        rows = np.arange(n)
+        for col in self.cols_:
+            tokens = (str(col) + "=" + df[col].astype(str)).to_numpy(dtype=object)
+            h = pd.util.hash_array(tokens)  # uint64, vectorized
+            buckets = (h % np.uint64(self.n_features)).astype(np.int64)
+            if self.alternate_sign:
+                signs = np.where((h >> np.uint64(63)) == 0, 1.0, -1.0)
+            else:
+                signs = 1.0
+            np.add.at(out, (rows, buckets), signs)
+        return out
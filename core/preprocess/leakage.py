@@ -10,6 +10,9 @@ from sklearn.feature_selection import mutual_info_classif, mutual_info_regressio
 from sklearn.preprocessing import LabelEncoder
 from typing import Dict
 
+from core.utils.logger import span
+from core.utils.helpers import report_progress
+
 def _mutual_info(x, y, discrete_target=False):
     # Choose correct mutual info func depending on y dtype
     try:
@@ -20,12 +23,14 @@ def _mutual_info(x, y, discrete_target=False):
     except Exception:
         return 0.0
 
-def detect_leakage(df: pd.DataFrame, target_col: str, config: Dict):
+def detect_leakage(df: pd.DataFrame, target_col: str, config: Dict, progress=None):
     report = { "leaks": [] }
     y = df[target_col].values
     discrete_target = pd.api.types.is_integer_dtype(df[target_col]) or pd.api.types.is_bool_dtype(df[target_col]) or pd.api.types.is_categorical_dtype(df[target_col]) or df[target_col].nunique() < 20
 
-    for col in df.columns:
+    n_cols = len(df.columns)
+    for i, col in enumerate(df.columns):
+        report_progress(progress, i / n_cols, f"leakage: {col}")
         if col == target_col:
             continue
         series = df[col]
@@ -34,32 +39,36 @@ def detect_leakage(df: pd.DataFrame, target_col: str, config: Dict):
             # handle constant or nan
             if series.nunique(dropna=True) <= 1:
                 continue
-            corr = series.corr(df[target_col])
+            with span("leakage.correlation"):
+                corr = series.corr(df[target_col])
             if pd.notna(corr) and abs(corr) >= config.get("leakage_corr_threshold", 0.95):
                 report["leaks"].append({"column": col, "reason": "high_correlation", "value": float(corr)})
                 continue
         # exact or near-mapping for categorical-like
         if series.nunique(dropna=True) < 50:
             # create mapping accuracy
-            tmp = pd.DataFrame({"x": series.astype(str), "y": df[target_col].astype(str)})
-            best_map = tmp.groupby("x")["y"].agg(lambda s: s.mode().iat[0] if len(s.mode())>0 else None)
-            preds = tmp["x"].map(best_map)
-            acc = (preds == tmp["y"]).mean()
+            with span("leakage.mapping"):
+                tmp = pd.DataFrame({"x": series.astype(str), "y": df[target_col].astype(str)})
+                best_map = tmp.groupby("x")["y"].agg(lambda s: s.mode().iat[0] if len(s.mode())>0 else None)
+                preds = tmp["x"].map(best_map)
+                acc = (preds == tmp["y"]).mean()
             if acc >= 0.95:
                 report["leaks"].append({"column": col, "reason": "almost_perfect_mapping", "value": float(acc)})
                 continue
         # mutual information heuristic
         try:
-            xi = series.fillna(-9999)
-            if pd.api.types.is_numeric_dtype(series):
-                mi = _mutual_info(xi.values.astype(float), y, discrete_target)
-            else:
-                le = LabelEncoder()
-                xi_enc = le.fit_transform(xi.astype(str))
-                mi = _mutual_info(xi_enc, y, discrete_target)
+            with span("leakage.mutual_info"):
+                xi = series.fillna(-9999)
+                if pd.api.types.is_numeric_dtype(series):
+                    mi = _mutual_info(xi.values.astype(float), y, discrete_target)
+                else:
+                    le = LabelEncoder()
+                    xi_enc = le.fit_transform(xi.astype(str))
+                    mi = _mutual_info(xi_enc, y, discrete_target)
             if mi >= config.get("leakage_mi_threshold", 0.6):
                 report["leaks"].append({"column": col, "reason": "high_mutual_info", "value": float(mi)})
         except Exception:
             continue
 
+    report_progress(progress, 1.0, "leakage: done")
     return report
@@ -20,10 +20,17 @@ from sklearn.preprocessing import (
 from sklearn.impute import SimpleImputer
 
 from .config import DEFAULT_CONFIG
-from .transformers import ColumnSelector
+from .transformers import ColumnSelector, TimedStep
 from .rare_category import RareCategoryMerger
 from .missing_pattern import MissingIndicatorAdder
+from .high_cardinality import TargetEncoder, HashingEncoder
 from .leakage import detect_leakage
+from .drift_reference import build_reference
+from core.utils.logger import span, profile, current_profiler
+from core.utils.helpers import report_progress, sub_progress
+from core.utils.config import get_settings
+from core.utils.planner import plan_for_frame
+from core.eda.duplicates import drop_duplicate_rows
 
 
 # -----------------------------
@@ -37,6 +44,15 @@ def ensure_pandas(df):
     return df
 
 
+def resolve_config(config: Optional[Dict] = None) -> Dict:
+    """DEFAULT_CONFIG, then config.toml [preprocess], then explicit overrides."""
+    cfg = DEFAULT_CONFIG.copy()
+    cfg.update(get_settings()["preprocess"])
+    if config:
+        cfg.update(config)
+    return cfg
+
+
 def scaler_from_name(name: str):
     if name == "minmax":
         return MinMaxScaler()
@@ -45,6 +61,16 @@ def scaler_from_name(name: str):
     return StandardScaler()
 
 
+def timed_steps(steps, prefix: str, enabled: bool):
+    """Wrap (name, estimator) steps in TimedStep when profiling; column selection is skipped."""
+    if not enabled:
+        return steps
+    return [
+        (name, est if isinstance(est, ColumnSelector) else TimedStep(est, f"{prefix}.{name}"))
+        for name, est in steps
+    ]
+
+
 class PreprocessResult(NamedTuple):
     pipeline: Any
     processed_df: pd.DataFrame
@@ -58,9 +84,7 @@ class PreprocessResult(NamedTuple):
 def build_preprocessor(df, target_col=None, config: Optional[Dict] = None):
 
     df = ensure_pandas(df)
-    cfg = DEFAULT_CONFIG.copy()
-    if config:
-        cfg.update(config)
+    cfg = resolve_config(config)
 
     df_local = df.copy()
 
@@ -73,27 +97,57 @@ def build_preprocessor(df, target_col=None, config: Optional[Dict] = None):
     if target_col in categoricals:
         categoricals.remove(target_col)
 
+    # route categoricals by cardinality: one-hot below the limit,
+    # bounded-width encoding (target or hashing) above it
+    nunique = df_local[categoricals].nunique(dropna=True)
+    onehot_cats = [c for c in categoricals if nunique[c] < cfg["max_unique_for_onehot"]]
+    high_card_cats = [c for c in categoricals if c not in onehot_cats]
+
+    timed = bool(cfg["profile"]) or current_profiler() is not None
+
+    use_target = bool(cfg["target_encode"]) and target_col is not None and target_col in df_local.columns
+    high_card_encoding = "target" if use_target else "hashing"
+
     # numeric
-    num_pipeline = Pipeline([
+    num_pipeline = Pipeline(timed_steps([
         ("select", ColumnSelector(numerics)),
         ("impute", SimpleImputer(strategy=cfg["imputer_numeric_strategy"])),
         ("scale", scaler_from_name(cfg["scaler"]))
-    ])
+    ], "num", timed))
 
     # categorical
-    cat_pipeline = Pipeline([
-        ("select", ColumnSelector(categoricals)),
+    cat_pipeline = Pipeline(timed_steps([
+        ("select", ColumnSelector(onehot_cats)),
         ("rare", RareCategoryMerger(threshold=cfg["rare_threshold"])),
         ("impute", SimpleImputer(strategy=cfg["imputer_categorical_strategy"],
                                  fill_value="__MISSING__")),
         ("onehot", OneHotEncoder(handle_unknown="ignore", sparse_output=False))
-    ])
+    ], "cat", timed))
+
+    # high-cardinality categorical
+    if use_target:
+        high_card_encoder = TargetEncoder(
+            n_folds=cfg["target_encode_folds"],
+            smoothing=cfg["target_encode_smoothing"],
+        )
+    else:
+        high_card_encoder = HashingEncoder(n_features=cfg["hash_n_features"])
+
+    high_card_pipeline = Pipeline(timed_steps([
+        ("select", ColumnSelector(high_card_cats)),
+        ("impute", SimpleImputer(strategy="constant", fill_value="__MISSING__")),
+        ("encode", high_card_encoder)
+    ], "high_card", timed))
+
+    transformers = [
+        ("num", num_pipeline, numerics),
+        ("cat", cat_pipeline, onehot_cats),
+    ]
+    if high_card_cats:
+        transformers.append(("high_card", high_card_pipeline, high_card_cats))
 
     column_tf = ColumnTransformer(
-        transformers=[
-            ("num", num_pipeline, numerics),
-            ("cat", cat_pipeline, categoricals),
-        ],
+        transformers=transformers,
         remainder="drop"
     )
 
@@ -101,6 +155,7 @@ def build_preprocessor(df, target_col=None, config: Optional[Dict] = None):
 
     if cfg["missing_indicator"]:
         steps.append(("missing_ind", MissingIndicatorAdder()))
+    steps = timed_steps(steps, "pipeline", timed)
 
     steps.append(("preproc", column_tf))
 
@@ -109,6 +164,9 @@ def build_preprocessor(df, target_col=None, config: Optional[Dict] = None):
     meta = {
         "numerics": numerics,
         "categoricals": categoricals,
+        "onehot_categoricals": onehot_cats,
+        "high_cardinality_categoricals": high_card_cats,
+        "high_cardinality_encoding": high_card_encoding if high_card_cats else None,
         "config": cfg
     }
 
@@ -119,43 +177,121 @@ def build_preprocessor(df, target_col=None, config: Optional[Dict] = None):
 # Fit + Transform
 # -----------------------------
 
-def fit_preprocessor(df, target_col=None, config=None) -> PreprocessResult:
-
-    df = ensure_pandas(df)
-    pipe, meta = build_preprocessor(df, target_col, config)
-
-    cfg = meta["config"]
-
-    # Leakage
-    leak_report = {}
-    if target_col and target_col in df.columns:
-        leak_report = detect_leakage(df, target_col, cfg)
-
-    # Prepare X / y
-    if target_col and target_col in df.columns:
-        X = df.drop(columns=[target_col])
-        y = df[target_col]
-    else:
-        X = df
-        y = None
-
-    pipe.fit(X, y)
-
-    X_processed = pipe.transform(X)
-
-    # numpy → pandas
-    if hasattr(X_processed, "toarray"):
-        X_processed = X_processed.toarray()
-
-    processed_df = pd.DataFrame(X_processed)
+def _dense(X):
+    return X.toarray() if hasattr(X, "toarray") else X
+
+
+def _planned_fit_transform(pipe, X, y, plan, sample_idx, progress=None):
+    """
+    In-memory fit_transform, or (chunked/sampled plans) fit on the row sample and
+    transform the remaining rows chunk by chunk so the working set stays bounded.
+    Every input row gets an output row, in input order, whatever the engine.
+    """
+    if sample_idx is None:
+        return pipe.fit_transform(X, y)
+
+    y_fit = y.iloc[sample_idx] if y is not None else None
+    fitted = _dense(pipe.fit_transform(X.iloc[sample_idx], y_fit))
+    out = np.empty((len(X), fitted.shape[1]), dtype=float)
+    out[sample_idx] = fitted
+    rest = np.setdiff1d(np.arange(len(X)), sample_idx)
+    for start in range(0, len(rest), plan.chunk_size):
+        report_progress(progress, start / max(len(rest), 1), "transforming chunks")
+        rows = rest[start:start + plan.chunk_size]
+        out[rows] = _dense(pipe.transform(X.iloc[rows]))
+    return out
+
+
+def fit_preprocessor(df, target_col=None, config=None, progress=None) -> PreprocessResult:
+
+    cfg = resolve_config(config)
+
+    with profile(cfg["profile"], cfg["profile_memory"]) as prof:
+        mark = prof.mark() if prof else 0
+
+        with span("fit_preprocessor"):
+            with span("to_pandas"):
+                df = ensure_pandas(df)
+            input_shape = df.shape
+
+            dedupe = {}
+            if cfg["dedupe"]:
+                with span("dedupe", mode=cfg["dedupe"]):
+                    n_before = len(df)
+                    df = drop_duplicate_rows(df, mode=cfg["dedupe"], threshold=cfg["dedupe_threshold"]).reset_index(drop=True)
+                dedupe = {"mode": cfg["dedupe"], "rows_removed": n_before - len(df)}
+
+            report_progress(progress, 0.0, "building preprocessor")
+            # pick in-memory vs sample-fit/chunked execution from the memory budget
+            with span("plan_execution"):
+                plan = plan_for_frame(df)
+            sample_idx = None
+            if plan.engine in ("chunked", "sampled") and plan.sample_rows and plan.sample_rows < len(df):
+                rng = np.random.RandomState(0)
+                sample_idx = np.sort(rng.choice(len(df), size=max(plan.sample_rows, 1), replace=False))
+            fit_df = df if sample_idx is None else df.iloc[sample_idx]
+
+            with span("build_preprocessor"):
+                pipe, meta = build_preprocessor(fit_df, target_col, config)
+
+            # Leakage
+            leak_report = {}
+            if target_col and target_col in df.columns:
+                with span("detect_leakage"):
+                    leak_report = detect_leakage(fit_df, target_col, cfg, progress=sub_progress(progress, 0.05, 0.5))
+
+            # Prepare X / y
+            if target_col and target_col in df.columns:
+                X = df.drop(columns=[target_col])
+                y = df[target_col]
+            else:
+                X = df
+                y = None
+
+            # fit_transform (not fit + transform) so target encoding is out-of-fold
+            report_progress(progress, 0.5, "fitting pipeline")
+            with span("pipeline.fit_transform"):
+                X_processed = _planned_fit_transform(
+                    pipe, X, y, plan, sample_idx, progress=sub_progress(progress, 0.5, 0.9)
+                )
+
+            # training-time sketches the serving drift monitor compares traffic against
+            with span("drift_reference"):
+                drift_reference = build_reference(
+                    pipe, X if sample_idx is None else X.iloc[sample_idx], n_bins=cfg["drift_bins"]
+                )
+
+            # numpy → pandas
+            report_progress(progress, 0.9, "building processed frame")
+            with span("to_dataframe"):
+                if hasattr(X_processed, "toarray"):
+                    X_processed = X_processed.toarray()
+
+                processed_df = pd.DataFrame(X_processed)
+
+            if sample_idx is not None:
+                # what the plan bounds and what it doesn't, so the recorded reason isn't overstated
+                out_mb = processed_df.shape[0] * processed_df.shape[1] * 8 / 1024 ** 2
+                plan = plan._replace(reason=(
+                    f"{plan.reason}. Fitted on {len(sample_idx)} sampled rows and transformed all "
+                    f"{len(df)} rows in chunks of {plan.chunk_size}. Not bounded by the plan: the "
+                    f"full input is already a pandas frame (any conversion happened before planning) "
+                    f"and the processed output is one dense array of {out_mb:.0f} MB"
+                ))
 
     summary = {
-        "input_shape": df.shape,
+        "input_shape": input_shape,
         "processed_shape": processed_df.shape,
         "leak_report": leak_report,
+        "dedupe": dedupe,
+        "execution_plan": plan.to_dict(),
+        "drift_reference": drift_reference,
         "meta": meta
     }
+    if prof is not None:
+        summary["profile"] = prof.summary(since=mark)
 
+    report_progress(progress, 1.0, "preprocessing done")
     return PreprocessResult(
         pipeline=pipe,
         processed_df=processed_df,
@@ -10,6 +10,8 @@ class RareCategoryMerger(BaseEstimator, TransformerMixin):
         self.threshold = threshold
         self.fill_value = fill_value
         self.frequent_maps_ = {}
+        self.frequencies_ = {}
+        self.missing_shares_ = {}
 
     def fit(self, X, y=None):
         # X expected to be DataFrame or 2D array-like with column names preserved
@@ -18,6 +20,10 @@ class RareCategoryMerger(BaseEstimator, TransformerMixin):
             freqs = df[col].value_counts(normalize=True)
             keep = set(freqs[freqs >= self.threshold].index)
             self.frequent_maps_[col] = keep
+            # training share of every kept category (used as the drift reference)
+            self.frequencies_[col] = freqs[freqs >= self.threshold].to_dict()
+            # frequencies are over non-missing values; the drift reference also needs the missing share
+            self.missing_shares_[col] = float(df[col].isna().mean()) if len(df) else 0.0
         return self
 
     def transform(self, X):
@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
 
+from core.utils.logger import span
+
 class ColumnSelector(BaseEstimator, TransformerMixin):
     def __init__(self, columns: List[str]):
         self.columns = columns
@@ -17,4 +19,33 @@ class IdentityTransformer(BaseEstimator, TransformerMixin):
     def fit(self, X, y=None): return self
     def transform(self, X): return X
 
+class TimedStep(BaseEstimator, TransformerMixin):
+    """
+    Wrap a transformer so fit/transform run inside profiler spans.
+    Only used when profiling is requested; unknown attributes (statistics_,
+    categories_, ...) are delegated to the wrapped estimator.
+    """
+    def __init__(self, estimator, name="step"):
+        self.estimator = estimator
+        self.name = name
+
+    def fit(self, X, y=None):
+        with span(f"{self.name}.fit"):
+            self.estimator.fit(X, y)
+        return self
+
+    def fit_transform(self, X, y=None, **fit_params):
+        # delegate so estimators with their own fit_transform (e.g. out-of-fold encoders) keep it
+        with span(f"{self.name}.fit_transform"):
+            return self.estimator.fit_transform(X, y, **fit_params)
+
+    def transform(self, X):
+        with span(f"{self.name}.transform"):
+            return self.estimator.transform(X)
+
+    def __getattr__(self, attr):
+        if attr.startswith("__") or attr == "estimator":
+            raise AttributeError(attr)
+        return getattr(self.estimator, attr)
+
 # Simple FunctionTransformer-style wrappers are possible, but keep custom ones here.
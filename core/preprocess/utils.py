@@ -13,3 +13,14 @@ def save_json(obj, path: str):
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(obj, f, indent=2, default=str)
+
+def input_column_kinds(pipeline) -> dict:
+    """{raw input column: "numeric" | "categorical"} as routed by a fitted build_preprocessor pipeline."""
+    column_tf = pipeline.named_steps["preproc"]
+    kinds = {}
+    for name, _, cols in column_tf.transformers_:
+        if name == "remainder":
+            continue
+        for col in cols:
+            kinds[str(col)] = "numeric" if name == "num" else "categorical"
+    return kinds
@@ -0,0 +1,106 @@
+"""
+Application settings loaded from config.toml (falls back to defaults when
+the file or a key is missing).
+
+    [resources]   memory budget, n_jobs, chunk size used by the execution planner
+    [paths]       upload / cache / job directories
+    [jobs]        how long finished background job results are kept
+    [preprocess]  overrides for core.preprocess.config.DEFAULT_CONFIG
+    [nlp]         text-generation backend used by the insights page
+    [serving]     artifacts served by the API and drift monitor schedule
+"""
+import copy
+import os
+from functools import lru_cache
+from typing import Any, Dict
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+CONFIG_PATH = os.environ.get("AUTODATASET_CONFIG", "config.toml")
+
+DEFAULT_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "resources": {
+        "memory_budget_mb": 0,         # 0 = auto: memory_fraction x available RAM
+        "memory_fraction": 0.7,
+        "n_jobs": -1,                  # -1 = all cores
+        "chunk_size": 100_000,         # rows per chunk for chunked/streaming work
+        "working_set_factor": 4.0,     # peak memory / frame size during preprocessing
+        "csv_expansion_factor": 2.5,   # in-memory frame size / CSV file size
+        "polars_min_mb": 512,          # frames at least this big load with polars
+    },
+    "paths": {
+        "upload_dir": "uploaded_files",
+        "cache_dir": ".cache",
+        "jobs_dir": ".jobs",
+    },
+    "jobs": {
+        "result_ttl_hours": 24,        # finished jobs (and their result files) older than this are deleted
+        "max_results": 50,             # keep at most this many finished jobs
+    },
+    "preprocess": {},
+    "serving": {
+        "artifacts_dir": "artifacts",  # preprocessor.pkl, drift_reference.json, optional model.pkl
+        "drift_interval_seconds": 60,
+        "drift_min_samples": 200,      # smaller windows keep accumulating
+        "drift_max_queue": 256,        # queued request batches; extra batches are dropped
+    },
+    "nlp": {
+        "backend": "auto",             # "auto" | "transformers" | "stub"
+        "model": "",                   # local seq2seq model directory; "auto" stays on the stub without one
+        "max_new_tokens": 256,
+    },
+}
+
+
+def _read_toml(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    if tomllib is not None:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    import toml  # streamlit dependency, used when tomllib/tomli are unavailable
+    return toml.load(path)
+
+
+def _merge(base: Dict, override: Dict) -> Dict:
+    out = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = _merge(out[key], value)
+        else:
+            out[key] = value
+    return out
+
+
+def load_settings(path: str = CONFIG_PATH) -> Dict:
+    return _merge(DEFAULT_SETTINGS, _read_toml(path))
+
+
+@lru_cache(maxsize=None)
+def _cached_settings(path: str) -> Dict:
+    return load_settings(path)
+
+
+def get_settings(path: str = CONFIG_PATH) -> Dict:
+    """Settings for the process (read once; call reload_settings() after editing the file)."""
+    return copy.deepcopy(_cached_settings(path))
+
+
+def reload_settings():
+    _cached_settings.cache_clear()
+
+
+def resolve_n_jobs(value=None) -> int:
+    """n_jobs setting as a worker count (-1/0 = all cores)."""
+    if value is None:
+        value = get_settings()["resources"]["n_jobs"]
+    value = int(value)
+    if value <= 0:
+        return os.cpu_count() or 1
+    return value
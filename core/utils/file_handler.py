@@ -1,6 +1,12 @@
 import os
+from typing import Dict, Iterator, Optional
 
-UPLOAD_DIR = "uploaded_files"
+import numpy as np
+
+from .config import get_settings
+from .planner import ExecutionPlan, plan_for_file
+
+UPLOAD_DIR = get_settings()["paths"]["upload_dir"]
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 def save_uploaded_file(uploaded_file):
@@ -11,3 +17,118 @@ def save_uploaded_file(uploaded_file):
         f.write(uploaded_file.getbuffer())
 
     return file_path
+
+
+def _is_parquet(path: str) -> bool:
+    return path.endswith((".parquet", ".pq"))
+
+
+def arrow_column_types(kinds: Dict[str, str]) -> Dict:
+    """{column: "numeric" | "categorical"} -> pyarrow types (float64 / string)."""
+    import pyarrow as pa
+    return {col: pa.float64() if kind == "numeric" else pa.string() for col, kind in kinds.items()}
+
+
+def stable_column_types(path: str, block_size: int = 1 << 24) -> Dict:
+    """
+    CSV column types that later blocks can't contradict as easily as the
+    first-block inference: integers widen to float64, and everything that
+    isn't numeric, boolean or a timestamp is read as string.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    schema = pacsv.open_csv(path, read_options=pacsv.ReadOptions(block_size=block_size)).schema
+    types = {}
+    for field in schema:
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            types[field.name] = pa.float64()
+        elif pa.types.is_boolean(field.type) or pa.types.is_timestamp(field.type):
+            types[field.name] = field.type
+        else:
+            types[field.name] = pa.string()
+    return types
+
+
+def iter_record_batches(path: str, block_size: int = 1 << 24, column_types: Optional[Dict] = None):
+    """
+    Stream a CSV/Parquet file as pyarrow RecordBatches.
+    For CSV, column_types ({name: pyarrow type}) pins the schema; without it
+    pyarrow infers types from the first block only, and a later value of
+    another type fails the read mid-file.
+    """
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    if _is_parquet(path):
+        yield from pq.ParquetFile(path).iter_batches()
+    else:
+        reader = pacsv.open_csv(
+            path,
+            read_options=pacsv.ReadOptions(block_size=block_size),
+            convert_options=pacsv.ConvertOptions(column_types=column_types or {}),
+        )
+        yield from reader
+
+
+def iter_batches(path: str, batch_size: int, block_size: int = 1 << 24,
+                 column_types: Optional[Dict] = None) -> Iterator:
+    """Re-chunk a file into pyarrow Tables of exactly batch_size rows (last one may be shorter)."""
+    import pyarrow as pa
+
+    buffer, buffered = [], 0
+    for rb in iter_record_batches(path, block_size, column_types):
+        buffer.append(rb)
+        buffered += rb.num_rows
+        while buffered >= batch_size:
+            table = pa.Table.from_batches(buffer)
+            yield table.slice(0, batch_size)
+            rest = table.slice(batch_size)
+            buffer, buffered = rest.to_batches(), rest.num_rows
+    if buffered:
+        yield pa.Table.from_batches(buffer)
+
+
+def _compact(frame):
+    """Shrink a polars frame by dictionary-encoding string columns."""
+    import polars as pl
+    return frame.with_columns(pl.col(pl.Utf8).cast(pl.Categorical))
+
+
+def load_dataset(path: str, plan: Optional[ExecutionPlan] = None, seed: int = 0,
+                 column_types: Optional[Dict] = None):
+    """
+    Load a CSV/Parquet file with the engine chosen by the execution planner.
+    Returns a pandas DataFrame for the "pandas" engine and a polars DataFrame otherwise.
+    Streamed (chunked/sampled) CSV reads use column_types, or stable_column_types(path).
+    """
+    import pandas as pd
+    import polars as pl
+
+    plan = plan or plan_for_file(path)
+
+    if plan.engine == "pandas":
+        return pd.read_parquet(path) if _is_parquet(path) else pd.read_csv(path)
+
+    if plan.engine == "polars":
+        if _is_parquet(path):
+            return pl.read_parquet(path)
+        return pl.read_csv(path, n_threads=plan.n_jobs)
+
+    # chunked: keep every row but compact each chunk as it streams in
+    # sampled: keep a uniform (Bernoulli) sample of each chunk
+    keep_fraction = 1.0
+    if plan.engine == "sampled" and plan.sample_rows and plan.n_rows:
+        keep_fraction = min(1.0, plan.sample_rows / plan.n_rows)
+    rng = np.random.RandomState(seed)
+    if column_types is None and not _is_parquet(path):
+        column_types = stable_column_types(path)
+
+    parts = []
+    with pl.StringCache():
+        for table in iter_batches(path, plan.chunk_size, column_types=column_types):
+            chunk = pl.from_arrow(table)
+            if keep_fraction < 1.0:
+                chunk = chunk.filter(pl.Series(rng.rand(chunk.height) < keep_fraction))
+            parts.append(_compact(chunk))
+        return pl.concat(parts, how="vertical_relaxed") if parts else pl.DataFrame()
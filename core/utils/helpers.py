@@ -0,0 +1,20 @@
+from typing import Callable, Optional
+
+# progress callbacks take (fraction in [0, 1], message)
+ProgressFn = Callable[[float, str], None]
+
+
+def report_progress(progress: Optional[ProgressFn], fraction: float, message: str = ""):
+    """Call a progress callback if one was given."""
+    if progress is not None:
+        progress(min(max(fraction, 0.0), 1.0), message)
+
+
+def sub_progress(progress: Optional[ProgressFn], start: float, end: float) -> Optional[ProgressFn]:
+    """Map a nested step's 0..1 progress onto the [start, end] range of the caller."""
+    if progress is None:
+        return None
+
+    def _scaled(fraction: float, message: str = ""):
+        progress(start + (end - start) * fraction, message)
+    return _scaled
@@ -0,0 +1,288 @@
+"""
+Local background jobs for long-running page operations.
+
+Jobs run on a thread pool so Streamlit reruns don't kill them; their state
+(status, progress, message, error, result file) lives in SQLite so any rerun
+or page can poll it. Job functions receive a `progress(fraction, message)`
+callback, which is also the cancellation point: once a job is cancelled the
+next progress call raises JobCancelled. Submitting a job with the same key as
+one that is still queued/running returns the existing job id.
+
+Finished jobs don't keep their results forever: discard() removes one job's
+result (and any files it declared), and purge() drops finished jobs older
+than the retention age or beyond the newest max_results. purge() runs when
+the runner starts and after every job.
+
+Jobs run outside the caller's profiler (a pool thread doesn't see its
+context), so submit(..., profile=True) profiles the job on its own thread
+and keeps the step summary with the job; read it back with profile_summary().
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import joblib
+
+from .config import get_settings
+from .logger import profile as profiling
+
+JOBS_DIR = get_settings()["paths"]["jobs_dir"]
+RETENTION = get_settings()["jobs"]
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled."""
+
+
+def job_key(*parts) -> str:
+    """Stable dedupe key from arbitrary (repr-able) parts."""
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(repr(p).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def dataframe_fingerprint(df) -> str:
+    import pandas as pd
+    if hasattr(df, "to_pandas"):
+        df = df.to_pandas()
+    row_hash = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return job_key(list(df.columns), [str(t) for t in df.dtypes], row_hash.tobytes())
+
+
+class JobStore:
+    """SQLite-backed job table. One short-lived connection per call keeps it thread-safe."""
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT,
+                    key TEXT,
+                    status TEXT,
+                    progress REAL,
+                    message TEXT,
+                    error TEXT,
+                    result_path TEXT,
+                    created REAL,
+                    updated REAL,
+                    files TEXT,
+                    profile TEXT
+                )
+            """)
+            # databases created before these columns existed
+            columns = {row[1] for row in con.execute("PRAGMA table_info(jobs)")}
+            for column in ("files", "profile"):
+                if column not in columns:
+                    con.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+            con.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs(key, status)")
+
+    def _conn(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def insert(self, job_id: str, kind: str, key: str, files: Sequence[str] = ()):
+        now = time.time()
+        with self._conn() as con:
+            con.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, 0.0, '', NULL, NULL, ?, ?, ?, NULL)",
+                (job_id, kind, key, QUEUED, now, now, json.dumps(list(files))),
+            )
+
+    def delete(self, job_id: str):
+        with self._conn() as con:
+            con.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def expired(self, max_age: Optional[float], max_results: Optional[int]) -> List[str]:
+        """Finished jobs older than max_age seconds or beyond the newest max_results."""
+        with self._conn() as con:
+            rows = con.execute(
+                "SELECT id, updated FROM jobs WHERE status NOT IN (?, ?) ORDER BY updated DESC",
+                ACTIVE_STATES,
+            ).fetchall()
+        cutoff = time.time() - max_age if max_age is not None else None
+        return [job_id for i, (job_id, updated) in enumerate(rows)
+                if (max_results is not None and i >= max_results) or (cutoff is not None and updated < cutoff)]
+
+    def update(self, job_id: str, **fields):
+        fields["updated"] = time.time()
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._conn() as con:
+            con.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._conn() as con:
+            con.row_factory = sqlite3.Row
+            row = con.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def find_active(self, key: str) -> Optional[str]:
+        with self._conn() as con:
+            row = con.execute(
+                "SELECT id FROM jobs WHERE key = ? AND status IN (?, ?) ORDER BY created DESC LIMIT 1",
+                (key, *ACTIVE_STATES),
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_orphans(self, message: str = "interrupted (process restarted)"):
+        # jobs left active by a previous process can never finish
+        with self._conn() as con:
+            con.execute(
+                "UPDATE jobs SET status = ?, message = ?, updated = ? WHERE status IN (?, ?)",
+                (FAILED, message, time.time(), *ACTIVE_STATES),
+            )
+
+
+class JobRunner:
+    def __init__(self, jobs_dir: str = JOBS_DIR, max_workers: int = 2, progress_interval: float = 0.25,
+                 result_ttl: Optional[float] = RETENTION["result_ttl_hours"] * 3600,
+                 max_results: Optional[int] = RETENTION["max_results"]):
+        self.jobs_dir = Path(jobs_dir)
+        self.store = JobStore(str(self.jobs_dir / "jobs.sqlite"))
+        self.store.mark_orphans()
+        self.progress_interval = progress_interval
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="autodataset-job")
+        self._cancelled = set()
+        self._lock = threading.Lock()
+        self.purge()
+
+    def submit(self, kind: str, fn: Callable, *args, key: Optional[str] = None,
+               files: Sequence[str] = (), profile: bool = False, **kwargs) -> str:
+        """
+        Run fn(*args, progress=..., **kwargs) in the background and return the job id.
+        If key matches a queued/running job, that job's id is returned instead.
+        files are output paths the job writes; they are deleted with its result.
+        profile=True records the job's spans (see profile_summary()).
+        """
+        with self._lock:
+            if key is not None:
+                existing = self.store.find_active(key)
+                if existing is not None:
+                    return existing
+            job_id = uuid.uuid4().hex
+            self.store.insert(job_id, kind, key or job_id, files)
+        self._pool.submit(self._run, job_id, fn, args, kwargs, profile)
+        return job_id
+
+    def _progress_callback(self, job_id: str):
+        last = [0.0]
+
+        def progress(fraction: float, message: str = ""):
+            if job_id in self._cancelled:
+                raise JobCancelled(job_id)
+            now = time.monotonic()
+            # throttle writes; always record completion
+            if now - last[0] >= self.progress_interval or fraction >= 1.0:
+                last[0] = now
+                self.store.update(job_id, progress=float(fraction), message=message)
+        return progress
+
+    def _run(self, job_id: str, fn: Callable, args, kwargs, profile: bool = False):
+        if job_id in self._cancelled:
+            self.store.update(job_id, status=CANCELLED, message="cancelled before start")
+            return
+        self.store.update(job_id, status=RUNNING)
+        try:
+            with profiling(enabled=profile) as prof:
+                result = fn(*args, progress=self._progress_callback(job_id), **kwargs)
+            if prof is not None:
+                self.store.update(job_id, profile=json.dumps(prof.summary()))
+            result_path = self.jobs_dir / "results" / f"{job_id}.pkl"
+            result_path.parent.mkdir(parents=True, exist_ok=True)
+            joblib.dump(result, result_path)
+            self.store.update(job_id, status=DONE, progress=1.0, message="done", result_path=str(result_path))
+        except JobCancelled:
+            self.store.update(job_id, status=CANCELLED, message="cancelled")
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, message=str(e), error=traceback.format_exc())
+        finally:
+            self._cancelled.discard(job_id)
+            self.purge()
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def result(self, job_id: str) -> Any:
+        """Result of a finished job, or None if it is not done."""
+        job = self.store.get(job_id)
+        if not job or job["status"] != DONE or not job["result_path"]:
+            return None
+        return joblib.load(job["result_path"])
+
+    def profile_summary(self, job_id: str) -> Optional[Dict]:
+        """Step profile of a job submitted with profile=True (see Profiler.summary), else None."""
+        job = self.store.get(job_id)
+        if not job or not job["profile"]:
+            return None
+        return json.loads(job["profile"])
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.store.get(job_id)
+        if not job or job["status"] not in ACTIVE_STATES:
+            return False
+        self._cancelled.add(job_id)
+        if job["status"] == QUEUED:
+            self.store.update(job_id, status=CANCELLED, message="cancelled")
+        return True
+
+    def discard(self, job_id: str) -> bool:
+        """Delete a finished job's result and files and forget the job. Active jobs are kept."""
+        job = self.store.get(job_id)
+        if not job or job["status"] in ACTIVE_STATES:
+            return False
+        for path in [job["result_path"], *json.loads(job["files"] or "[]")]:
+            if path and os.path.exists(path):
+                os.remove(path)
+        self.store.delete(job_id)
+        return True
+
+    def purge(self) -> int:
+        """Discard finished jobs past the retention limits; returns how many were removed."""
+        expired = self.store.expired(self.result_ttl, self.max_results)
+        return sum(self.discard(job_id) for job_id in expired)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll: float = 0.05) -> Optional[Dict]:
+        """Job row once it is finished; None if it was already discarded."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.store.get(job_id)
+            if job is None or job["status"] not in ACTIVE_STATES:
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                return job
+            time.sleep(poll)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+_RUNNER: Optional[JobRunner] = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Process-wide runner shared by all Streamlit sessions and reruns."""
+    global _RUNNER
+    with _RUNNER_LOCK:
+        if _RUNNER is None:
+            _RUNNER = JobRunner()
+        return _RUNNER
@@ -0,0 +1,225 @@
+"""
+Lightweight instrumentation: timing spans with optional peak-memory tracking.
+
+Library code calls `span("name")` unconditionally; it is a shared no-op
+context unless a profiler has been activated with `profile()`, so the cost
+when profiling is off is one context-variable lookup per span.
+
+    with profile() as prof:
+        with span("load"):
+            ...
+    prof.steps()            # per-step totals
+    prof.to_chrome_trace()  # chrome://tracing / Perfetto JSON
+"""
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+_ACTIVE = contextvars.ContextVar("autodataset_profiler", default=None)
+_NULL_SPAN = nullcontext()
+
+# tracemalloc is process-wide (one peak counter, one on/off switch), so at most
+# one profiler tracks memory at a time; concurrent ones report it as unavailable
+_MEMORY_LOCK = threading.Lock()
+_MEMORY_OWNER: Optional["Profiler"] = None
+
+
+def _max_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 1 / (1024 * 1024) if sys.platform == "darwin" else 1 / 1024
+    return round(rss * scale, 2)
+
+
+class Profiler:
+    """
+    Records timed spans. Memory peaks come from tracemalloc (allocations made
+    through Python, including numpy/pandas buffers) and are reported relative
+    to the memory in use when the span started. While another profiler owns
+    tracemalloc (e.g. a concurrent background job), peak_mem_mb is None.
+    """
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.memory_tracked = False
+        self.events: List[Dict] = []
+        self._stack: List[Dict] = []
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+
+    def start(self):
+        global _MEMORY_OWNER
+        if self.track_memory:
+            with _MEMORY_LOCK:
+                if _MEMORY_OWNER is None:
+                    _MEMORY_OWNER = self
+                    self.memory_tracked = True
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start()
+                        self._started_tracemalloc = True
+        return self
+
+    def stop(self):
+        global _MEMORY_OWNER
+        with _MEMORY_LOCK:
+            if _MEMORY_OWNER is self:
+                if self._started_tracemalloc:
+                    tracemalloc.stop()
+                    self._started_tracemalloc = False
+                _MEMORY_OWNER = None
+
+    def mark(self) -> int:
+        """Position in the event list; pass to steps()/to_chrome_trace() to scope them."""
+        return len(self.events)
+
+    @contextmanager
+    def span(self, name: str, **args):
+        tracing = self.memory_tracked and tracemalloc.is_tracing()
+        frame = {"start_mem": 0, "peak": 0}
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent["peak"] = max(parent["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["start_mem"] = frame["peak"] = current
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            event = {
+                "name": name,
+                "start": start - self._origin,
+                "seconds": end - start,
+                "depth": len(self._stack),
+                "tid": threading.get_ident(),
+                "args": args,
+                "max_rss_mb": _max_rss_mb(),
+                "peak_mem_mb": None,
+            }
+            if tracing:
+                frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                event["peak_mem_mb"] = round((frame["peak"] - frame["start_mem"]) / 1e6, 3)
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent["peak"] = max(parent["peak"], frame["peak"])
+            self.events.append(event)
+
+    def steps(self, since: int = 0) -> List[Dict]:
+        """Aggregate events by name (first-seen order): calls, total seconds, max peaks."""
+        agg: Dict[str, Dict] = {}
+        for ev in self.events[since:]:
+            row = agg.setdefault(ev["name"], {
+                "step": ev["name"], "depth": ev["depth"], "calls": 0,
+                "seconds": 0.0, "peak_mem_mb": None, "max_rss_mb": None,
+            })
+            row["calls"] += 1
+            row["seconds"] += ev["seconds"]
+            for key in ("peak_mem_mb", "max_rss_mb"):
+                if ev[key] is not None:
+                    row[key] = ev[key] if row[key] is None else max(row[key], ev[key])
+        for row in agg.values():
+            row["seconds"] = round(row["seconds"], 6)
+        return list(agg.values())
+
+    def to_chrome_trace(self, since: int = 0) -> Dict:
+        pid = os.getpid()
+        events = []
+        for ev in self.events[since:]:
+            args = dict(ev["args"])
+            if ev["peak_mem_mb"] is not None:
+                args["peak_mem_mb"] = ev["peak_mem_mb"]
+            if ev["max_rss_mb"] is not None:
+                args["max_rss_mb"] = ev["max_rss_mb"]
+            events.append({
+                "name": ev["name"],
+                "ph": "X",
+                "ts": round(ev["start"] * 1e6, 3),
+                "dur": round(ev["seconds"] * 1e6, 3),
+                "pid": pid,
+                "tid": ev["tid"],
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self, since: int = 0) -> Dict:
+        steps = self.steps(since)
+        top = min((s["depth"] for s in steps), default=0)
+        return {
+            "total_seconds": round(sum(s["seconds"] for s in steps if s["depth"] == top), 6),
+            "memory_tracked": self.memory_tracked,
+            "steps": steps,
+            "chrome_trace": self.to_chrome_trace(since),
+        }
+
+
+def current_profiler() -> Optional[Profiler]:
+    return _ACTIVE.get()
+
+
+def span(name: str, **args):
+    """Time a block under the active profiler; no-op when none is active."""
+    prof = _ACTIVE.get()
+    if prof is None:
+        return _NULL_SPAN
+    return prof.span(name, **args)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of span()."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*a, **kw):
+            if _ACTIVE.get() is None:
+                return func(*a, **kw)
+            with span(label):
+                return func(*a, **kw)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile(enabled: bool = True, track_memory: bool = True):
+    """
+    Activate a profiler for the enclosed block and yield it.
+    Nested calls reuse the outer profiler; with enabled=False the currently
+    active profiler (or None) is yielded, so callers can still report spans
+    recorded on behalf of an outer profile.
+    """
+    current = _ACTIVE.get()
+    if current is not None or not enabled:
+        yield current
+        return
+    prof = Profiler(track_memory=track_memory).start()
+    token = _ACTIVE.set(prof)
+    try:
+        yield prof
+    finally:
+        _ACTIVE.reset(token)
+        prof.stop()
+
+
+def save_chrome_trace(trace: Dict, path: str) -> str:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(trace, f)
+    return path
@@ -0,0 +1,119 @@
+"""
+Resource-aware execution planning.
+
+Before loading or preprocessing a dataset we estimate its in-memory size and
+the peak working set, compare that with the memory budget from config.toml
+([resources]) and pick an engine:
+
+    pandas   everything fits comfortably; plain in-memory pandas
+    polars   fits, but the frame is large: multi-threaded columnar loading
+    chunked  the data fits but full-frame working copies don't: stream in
+             chunks (compact dtypes on load, fit on a sample and transform
+             chunk by chunk when preprocessing)
+    sampled  not even the data fits: work on a uniform row sample (approximate)
+
+The choice and the reason are recorded so pages/summaries can show them.
+"""
+import os
+from typing import Dict, NamedTuple, Optional
+
+from .config import get_settings, resolve_n_jobs
+
+
+class ExecutionPlan(NamedTuple):
+    engine: str
+    reason: str
+    data_mb: float
+    working_set_mb: float
+    budget_mb: float
+    n_rows: Optional[int]
+    sample_rows: Optional[int]
+    chunk_size: int
+    n_jobs: int
+
+    def to_dict(self) -> Dict:
+        return self._asdict()
+
+
+def available_memory_mb() -> Optional[float]:
+    """Currently available RAM (Linux MemAvailable, else physical pages)."""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def memory_budget_mb(resources: Optional[Dict] = None, available_mb: Optional[float] = None) -> float:
+    resources = resources or get_settings()["resources"]
+    if available_mb is None:
+        available_mb = available_memory_mb()
+    auto = available_mb * resources["memory_fraction"] if available_mb else float("inf")
+    explicit = resources["memory_budget_mb"]
+    return min(explicit, auto) if explicit else auto
+
+
+def estimate_frame_mb(df) -> float:
+    if hasattr(df, "estimated_size"):  # polars
+        return df.estimated_size("mb")
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def estimate_file(path: str, resources: Optional[Dict] = None, probe_bytes: int = 1 << 20):
+    """(estimated in-memory MB, estimated row count) for a CSV/Parquet file, without loading it."""
+    resources = resources or get_settings()["resources"]
+    size = os.path.getsize(path)
+    if path.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+        meta = pq.ParquetFile(path).metadata
+        # parquet is compressed; ~3x is a typical decoded/encoded ratio
+        return size * 3 / 1024 ** 2, meta.num_rows
+    with open(path, "rb") as f:
+        head = f.read(probe_bytes)
+    lines = max(head.count(b"\n"), 1)
+    n_rows = int(size / (len(head) / lines)) - 1 if head else 0
+    return size * resources["csv_expansion_factor"] / 1024 ** 2, max(n_rows, 0)
+
+
+def plan_execution(data_mb: float, n_rows: Optional[int] = None, resources: Optional[Dict] = None,
+                   available_mb: Optional[float] = None) -> ExecutionPlan:
+    resources = resources or get_settings()["resources"]
+    budget = memory_budget_mb(resources, available_mb)
+    working = data_mb * resources["working_set_factor"]
+    n_jobs = resolve_n_jobs(resources["n_jobs"])
+    chunk_size = int(resources["chunk_size"])
+
+    def plan(engine, reason, sample_rows=None):
+        return ExecutionPlan(engine, reason, round(data_mb, 2), round(working, 2), round(budget, 2),
+                             n_rows, sample_rows, chunk_size, n_jobs)
+
+    if working <= budget:
+        if data_mb < resources["polars_min_mb"]:
+            return plan("pandas", f"working set {working:.0f} MB fits the {budget:.0f} MB budget")
+        return plan("polars", f"working set {working:.0f} MB fits the {budget:.0f} MB budget; "
+                              f"data >= {resources['polars_min_mb']} MB so loading is columnar/multi-threaded")
+
+    # rows whose full working set fits the budget, used for fitting/sampling
+    fit_rows = int(n_rows * budget / working) if n_rows else None
+    if data_mb <= budget:
+        return plan("chunked", f"data {data_mb:.0f} MB fits but the {working:.0f} MB working set "
+                               f"exceeds the {budget:.0f} MB budget; processing in chunks of {chunk_size} rows",
+                    sample_rows=fit_rows)
+    return plan("sampled", f"data {data_mb:.0f} MB exceeds the {budget:.0f} MB budget; "
+                           f"using a uniform sample of ~{fit_rows} rows (results are approximate)",
+                sample_rows=fit_rows)
+
+
+def plan_for_frame(df, resources: Optional[Dict] = None, available_mb: Optional[float] = None) -> ExecutionPlan:
+    return plan_execution(estimate_frame_mb(df), len(df), resources, available_mb)
+
+
+def plan_for_file(path: str, resources: Optional[Dict] = None, available_mb: Optional[float] = None) -> ExecutionPlan:
+    data_mb, n_rows = estimate_file(path, resources)
+    return plan_execution(data_mb, n_rows, resources, available_mb)
@@ -2,6 +2,9 @@ import streamlit as st
 
 def set_df(df):
     st.session_state["df"] = df
+    # anything derived from the previous dataset is stale now
+    st.session_state.pop("dataset_profile", None)
+    st.session_state.pop("eda_analysis", None)
 
 def get_df():
     return st.session_state.get("df")
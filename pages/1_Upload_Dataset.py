@@ -2,7 +2,9 @@
 import streamlit as st
 import polars as pl
 from core.utils.sessions import set_df
-from core.utils.file_handler import save_uploaded_file
+from core.utils.file_handler import save_uploaded_file, load_dataset
+from core.utils.planner import plan_for_file
+from core.eda.column_index import get_column_index
 
 st.title("Upload Dataset")
 
@@ -16,17 +18,56 @@ if uploaded_file:
         st.error(f"Failed to save uploaded file: {e}")
         saved_path = None
 
-    # read into polars
+    # read with the engine the execution planner picks for this file size / RAM
     try:
-        df = pl.read_csv(uploaded_file)
+        if saved_path:
+            plan = plan_for_file(saved_path)
+            df = load_dataset(saved_path, plan)
+            st.session_state["execution_plan"] = plan.to_dict()
+            st.caption(f"Engine: **{plan.engine}** — {plan.reason}")
+        else:
+            df = pl.read_csv(uploaded_file)
         set_df(df)
+        st.session_state["dataset_name"] = uploaded_file.name
         st.success("File uploaded successfully!")
 
-        # NOTE: polars DataFrame properties: .height and .width (not funcs)
-        st.info(f"Rows: {df.height} | Columns: {df.width}")
+        # works for both polars and pandas frames
+        st.info(f"Rows: {df.shape[0]} | Columns: {df.shape[1]}")
 
         st.subheader("Preview (First 100 Rows)")
-        st.dataframe(df.head(100).to_pandas())
+        preview = df.head(100)
+        st.dataframe(preview.to_pandas() if hasattr(preview, "to_pandas") else preview)
+
+        # index this dataset's columns (no-op if unchanged) and look up related ones
+        index = get_column_index()
+        index.add_dataset(uploaded_file.name, df)
+        # lookups reuse the stored fingerprints instead of re-fingerprinting every column
+        related = index.related_columns(uploaded_file.name, k=3)
+        similar, joins = related["similar"], related["joins"]
+
+        if any(similar.values()) or joins:
+            with st.expander("🔗 Columns seen before"):
+                rows = [
+                    {
+                        "column": col,
+                        "match": f"{m['dataset']} / {m['column']}",
+                        "score": m["score"],
+                        "previous preprocessing": m["decisions"] or "-",
+                    }
+                    for col, matches in similar.items() for m in matches
+                ]
+                if rows:
+                    st.dataframe(rows, use_container_width=True)
+                if joins:
+                    st.markdown("**Possible join keys**")
+                    st.dataframe([
+                        {
+                            "column": j["source_column"],
+                            "joins": f"{j['dataset']} / {j['column']}",
+                            "containment": j["containment"],
+                        }
+                        for j in joins
+                    ], use_container_width=True)
 
     except Exception as e:
         st.error(f"Error loading CSV: {e}")
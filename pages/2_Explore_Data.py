@@ -2,15 +2,25 @@ import streamlit as st
 import pandas as pd
 import polars as pl
 import traceback
+import json
+import os
+import time
+import uuid
 
 from core.utils.sessions import get_df
 from core.eda.analyze import analyze_dataframe
 from core.eda.visualize import (
     plot_numeric_distribution,
     plot_categorical_distribution,
-    plot_correlation_heatmap
+    plot_correlation_heatmap,
+    plot_association_heatmap
 )
 from core.eda.report import generate_visual_eda_report
+from core.utils.logger import profile
+from core.utils.jobs import (
+    get_job_runner, job_key, dataframe_fingerprint,
+    JOBS_DIR, ACTIVE_STATES, FAILED, CANCELLED,
+)
 
 
 def app():
@@ -22,8 +32,89 @@ def app():
         st.warning("Upload a dataset first.")
         return
 
-    df = df_polars.to_pandas()
+    df = df_polars.to_pandas() if hasattr(df_polars, "to_pandas") else df_polars
+
+    profile_steps = st.sidebar.checkbox("Profile EDA steps", False)
+    near = st.sidebar.checkbox("Search near-duplicate rows", True)
+
+    with profile(enabled=profile_steps) as prof:
+        render(df, near, profile_steps)
+
+    if prof is not None:
+        # analysis and report run as jobs on other threads and carry their own profiles
+        cached = st.session_state.get("eda_analysis")
+        if cached is not None and cached[2] is not None:
+            render_profile(cached[2], "⏱ Analysis Step Profile", "eda_analysis_trace.json")
+        render_profile(prof.summary(), "⏱ Page Step Profile", "eda_trace.json")
+
+
+def render_profile(profile_summary, title="⏱ Step Profile", file_name="eda_trace.json"):
+    st.markdown("---")
+    st.subheader(title)
+    st.metric("Total seconds", profile_summary["total_seconds"])
+    if not profile_summary.get("memory_tracked", True):
+        st.caption("Peak memory unavailable: another profiled job was tracking memory at the same time.")
+    st.dataframe(pd.DataFrame(profile_summary["steps"]), use_container_width=True)
+    st.download_button(
+        label="Download Chrome Trace (JSON)",
+        data=json.dumps(profile_summary["chrome_trace"]).encode("utf-8"),
+        file_name=file_name,
+        mime="application/json",
+        key=file_name,
+    )
+
+
+def load_analysis(df, near=True, profile_steps=False):
+    """
+    analyze_dataframe() runs as a background job keyed by the data's fingerprint;
+    the result (and its step profile when profiling) is kept in the session
+    (set_df clears it), so reruns from widget clicks don't recompute or rehash anything.
+    """
+    cached = st.session_state.get("eda_analysis")
+    if cached is not None and cached[0] == near and (cached[2] is not None or not profile_steps):
+        return cached[1]
 
+    runner = get_job_runner()
+    key = job_key("eda_analysis", dataframe_fingerprint(df), near, profile_steps)
+    job_id = st.session_state.get("eda_analysis_job")
+    job = runner.status(job_id) if job_id else None
+    if job is None or job["key"] != key:
+        job_id = runner.submit("eda_analysis", analyze_dataframe, df, key=key, profile=profile_steps, near=near)
+        st.session_state["eda_analysis_job"] = job_id
+        job = runner.status(job_id)
+
+    if job["status"] in ACTIVE_STATES:
+        st.progress(job["progress"], text=f"⏳ Analyzing: {job['message'] or job['status']}")
+        if st.button("✖ Cancel analysis"):
+            runner.cancel(job_id)
+        time.sleep(1.0)
+        st.rerun()
+
+    if job["status"] in (CANCELLED, FAILED):
+        if job["status"] == CANCELLED:
+            st.warning("Analysis was cancelled.")
+        else:
+            st.error("Analysis failed.")
+            st.code(job["error"] or job["message"])
+        if st.button("🔁 Run analysis again"):
+            runner.discard(job_id)
+            st.session_state.pop("eda_analysis_job", None)
+            st.rerun()
+        return None
+
+    analysis = runner.result(job_id)
+    analysis_profile = runner.profile_summary(job_id)
+    # the session holds the result now; the copy on disk is no longer needed
+    runner.discard(job_id)
+    st.session_state.pop("eda_analysis_job", None)
+    if analysis is None:
+        # result expired before this session picked it up; analyze again
+        st.rerun()
+    st.session_state["eda_analysis"] = (near, analysis, analysis_profile)
+    return analysis
+
+
+def render(df, near=True, profile_steps=False):
     try:
         # -------------------------------
         # Preview
@@ -34,7 +125,9 @@ def app():
         # -------------------------------
         # Analysis summary
        # -------------------------------
-        analysis = analyze_dataframe(df)
+        analysis = load_analysis(df, near, profile_steps)
+        if analysis is None:
+            return
 
         with st.expander("📌 Overview"):
             st.json(analysis["overview"])
@@ -48,6 +141,13 @@ def app():
         with st.expander("🧩 Categorical Summary"):
             st.json(analysis["categorical_summary"])
 
+        with st.expander("🧬 Duplicates"):
+            dups = analysis["duplicates"]
+            d1, d2 = st.columns(2)
+            d1.metric("Exact duplicate rows", dups["exact_duplicate_rows"])
+            d2.metric("Near-duplicate rows", dups["near_duplicate_rows"])
+            st.json({"exact_groups": dups["exact_groups"], "near_clusters": dups["near_clusters"]})
+
         # -------------------------------
         # Visualizations
         # -------------------------------
@@ -87,28 +187,91 @@ def app():
             fig.set_size_inches(6, 4)
             st.pyplot(fig)
 
+        # CATEGORICAL ASSOCIATION
+        assoc = analysis["categorical_association"]
+        if assoc:
+            st.markdown("### 🧮 Categorical Association")
+            measure = st.radio("Measure", ["Cramér's V", "Theil's U"], horizontal=True)
+            if measure == "Cramér's V":
+                fig = plot_association_heatmap(assoc["cramers_v"])
+            else:
+                fig = plot_association_heatmap(assoc["theils_u"], title="Theil's U (row | column)")
+            fig.set_size_inches(6, 4)
+            st.pyplot(fig)
+
         # -------------------------------
         # DOWNLOAD REPORT
        # -------------------------------
         st.markdown("---")
         st.subheader("📥 Export EDA Report")
 
-        pdf_path = generate_visual_eda_report(df)
-        with open(pdf_path, "rb") as f:
-            st.download_button(
-                label="Download Report",
-                data=f,
-                file_name="eda_report.pdf",
-                mime="application/pdf"
+        if st.button("Generate Report"):
+            runner = get_job_runner()
+            key = job_key("eda_report", dataframe_fingerprint(df))
+            # one file per submission so discarding an old report never removes a newer one
+            pdf_path = os.path.join(JOBS_DIR, "reports", f"{uuid.uuid4().hex}.pdf")
+            os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+            previous = st.session_state.get("eda_report_job")
+            st.session_state["eda_report_job"] = runner.submit(
+                "eda_report", generate_visual_eda_report, df,
+                key=key, path=pdf_path, files=[pdf_path], profile=profile_steps,
             )
+            if previous and previous != st.session_state["eda_report_job"]:
+                runner.discard(previous)
 
-        st.success("EDA PDF report generated successfully.")
+        report_status()
 
     except Exception as e:
         st.error("Something went wrong inside Explore Data.")
         st.code(traceback.format_exc())
 
 
+# polls the background report job without rerunning the whole page
+@st.experimental_fragment(run_every=1.0)
+def report_status():
+    job_id = st.session_state.get("eda_report_job")
+    if job_id is None:
+        return
+
+    runner = get_job_runner()
+    job = runner.status(job_id)
+    if job is None:
+        return
+
+    if job["status"] in ACTIVE_STATES:
+        st.progress(job["progress"], text=f"⏳ {job['message'] or job['status']}")
+        if st.button("✖ Cancel report"):
+            runner.cancel(job_id)
+        return
+
+    if job["status"] == CANCELLED:
+        st.warning("Report generation was cancelled.")
+        return
+
+    if job["status"] == FAILED:
+        st.error("Report generation failed.")
+        st.code(job["error"] or job["message"])
+        return
+
+    pdf_path = runner.result(job_id)
+    if pdf_path is None or not os.path.exists(pdf_path):
+        st.info("This report has expired; generate it again.")
+        return
+    with open(pdf_path, "rb") as f:
+        st.download_button(
+            label="Download Report",
+            data=f,
+            file_name="eda_report.pdf",
+            mime="application/pdf"
+        )
+
+    st.success("EDA PDF report generated successfully.")
+
+    report_profile = runner.profile_summary(job_id)
+    if report_profile is not None:
+        render_profile(report_profile, "⏱ Report Step Profile", "eda_report_trace.json")
+
+
 # IMPORTANT
 # This MUST be here or Streamlit won't render the page
 app()
@@ -3,9 +3,15 @@ import pandas as pd
 import numpy as np
 import json
 import pickle
+import time
 
 from core.preprocess.pipeline import fit_preprocessor
+from core.eda.column_index import get_column_index, column_decisions
 from core.utils.sessions import get_df
+from core.utils.jobs import (
+    get_job_runner, job_key, dataframe_fingerprint,
+    ACTIVE_STATES, FAILED, CANCELLED,
+)
 
 # optional import (safe fallback)
 try:
@@ -64,6 +70,10 @@ def app():
             ["standard", "minmax", "robust"]
         ),
 
+        "max_unique_for_onehot": st.sidebar.number_input(
+            "Max categories for one-hot (above -> hashed)", 2, 1000, 20
+        ),
+
         "missing_indicator": st.sidebar.checkbox(
             "Add Missing Value Indicators", True
         ),
@@ -75,23 +85,76 @@ def app():
         "leakage_mi_threshold": st.sidebar.slider(
             "Mutual information leakage threshold", 0.01, 1.0, 0.6
         ),
+
+        "dedupe": st.sidebar.selectbox(
+            "Drop duplicate rows before fitting", [None, "exact", "near"],
+            format_func=lambda m: "off" if m is None else m
+        ),
+
+        "profile": st.sidebar.checkbox(
+            "Profile preprocessing steps", False
+        ),
     }
 
     run = st.sidebar.button("🚀 Run Preprocessing", use_container_width=True)
 
-    if not run:
-        return
+    runner = get_job_runner()
 
     # ==================================================================
-    # RUNNING PIPELINE
+    # RUNNING PIPELINE (background job, survives reruns)
     # ==================================================================
-    with st.spinner("⏳ Running preprocessing pipeline..."):
-        try:
-            result = fit_preprocessor(df, target_col=None, config=config)
-        except Exception as e:
-            st.error("❌ Preprocessing failed!")
-            st.exception(e)
-            return
+    if run:
+        key = job_key("preprocess", dataframe_fingerprint(df), sorted(config.items()))
+        previous = st.session_state.get("preprocess_job")
+        st.session_state["preprocess_job"] = runner.submit(
+            "preprocess", fit_preprocessor, df, key=key, target_col=None, config=config
+        )
+        if previous and previous != st.session_state["preprocess_job"]:
+            # the new run replaces the old result; no need to keep it on disk
+            runner.discard(previous)
+
+    job_id = st.session_state.get("preprocess_job")
+    if job_id is None:
+        return
+
+    job = runner.status(job_id)
+    if job is None:
+        st.session_state.pop("preprocess_job", None)
+        return
+
+    if job["status"] in ACTIVE_STATES:
+        st.progress(job["progress"], text=f"⏳ {job['message'] or job['status']}")
+        if st.button("✖ Cancel", use_container_width=True):
+            runner.cancel(job_id)
+        time.sleep(1.0)
+        st.rerun()
+
+    if job["status"] == CANCELLED:
+        st.warning("Preprocessing was cancelled.")
+        return
+
+    if job["status"] == FAILED:
+        st.error("❌ Preprocessing failed!")
+        st.code(job["error"] or job["message"])
+        return
+
+    # load the finished result from disk once per job, not on every rerun
+    cached = st.session_state.get("preprocess_result")
+    if cached is None or cached[0] != job_id:
+        cached = (job_id, runner.result(job_id))
+        st.session_state["preprocess_result"] = cached
+        dataset_name = st.session_state.get("dataset_name")
+        if cached[1] is not None and dataset_name:
+            # remembered so similar columns in later uploads can reuse these choices
+            get_column_index().record_decisions(dataset_name, column_decisions(cached[1].summary["meta"]))
+    result = cached[1]
+    if result is None:
+        return
+
+    render_result(result)
+
+
+def render_result(result):
 
     st.success("🎉 Preprocessing Completed Successfully!")
 
@@ -111,6 +174,14 @@ def app():
 
     st.divider()
 
+    dedupe = result.summary.get("dedupe")
+    if dedupe:
+        st.caption(f"Dropped **{dedupe['rows_removed']}** {dedupe['mode']} duplicate rows before fitting.")
+
+    plan = result.summary.get("execution_plan")
+    if plan:
+        st.caption(f"Execution engine: **{plan['engine']}** — {plan['reason']}")
+
     # ==================================================================
     # LEAKAGE REPORT
     # ==================================================================
@@ -125,6 +196,25 @@ def app():
 
     st.divider()
 
+    # ==================================================================
+    # STEP PROFILE
+    # ==================================================================
+    prof = result.summary.get("profile")
+    if prof:
+        st.markdown("<h3>⏱️ Step Profile</h3>", unsafe_allow_html=True)
+        st.metric("Total seconds", prof["total_seconds"])
+        if not prof.get("memory_tracked", True):
+            st.caption("Peak memory unavailable: another profiled job was tracking memory at the same time.")
+        st.dataframe(pd.DataFrame(prof["steps"]), use_container_width=True)
+        st.download_button(
+            label="⬇️ Download Chrome Trace (JSON)",
+            data=json.dumps(prof["chrome_trace"]).encode("utf-8"),
+            file_name="preprocessing_trace.json",
+            mime="application/json",
+            use_container_width=True
+        )
+        st.divider()
+
     # ==================================================================
     # PROCESSED DATA PREVIEW
     # ==================================================================
@@ -173,6 +263,17 @@ def app():
         use_container_width=True
     )
 
+    # --- Download drift reference (serve it next to the pipeline) ---
+    reference = result.summary.get("drift_reference")
+    if reference:
+        st.download_button(
+            label="📡 Download Drift Reference (JSON)",
+            data=json.dumps(reference, indent=2).encode("utf-8"),
+            file_name="drift_reference.json",
+            mime="application/json",
+            use_container_width=True
+        )
+
 
 if __name__ == "__main__":
     app()
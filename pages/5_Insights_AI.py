@@ -1,9 +1,12 @@
+import time
+
 import streamlit as st
-import pandas as pd
-from core.nlp.explain_columns import explain_columns
-from core.nlp.insights import generate_insights
-from core.nlp.summarize import summarize_dataset
-from core.utils.file_handler import load_dataset
+from core.nlp.backends import get_backend
+from core.nlp.insights import generate_all
+from core.nlp.profile import build_profile, profile_hash
+from core.nlp import explain_columns, summarize, insights
+from core.utils.sessions import get_df
+from core.utils.jobs import get_job_runner, job_key, ACTIVE_STATES, FAILED, CANCELLED
 
 st.set_page_config(
     page_title="AI Insights",
@@ -14,13 +17,63 @@ st.set_page_config(
 st.title("Insights AI")
 
 # Load dataset
-uploaded_file = st.session_state.get("uploaded_file", None)
+df = get_df()
 
-if uploaded_file is None:
+if df is None:
     st.warning("Upload a dataset first from the 'Upload Dataset' page.")
     st.stop()
 
-df = load_dataset("data/current.csv")
+# the profile is computed once per uploaded dataset; prompts are built from it, not the raw frame
+profile = st.session_state.get("dataset_profile")
+if profile is None:
+    with st.spinner("Profiling dataset..."):
+        profile = build_profile(df)
+    st.session_state["dataset_profile"] = profile
+
+backend = get_backend()
+st.sidebar.caption(f"Backend: **{backend.name}**")
+
+# one batched model call in a background job (answers are also cached on disk by
+# profile hash); the page only polls, so a slow model never blocks a rerun
+key = job_key("insights", profile_hash(profile), backend.name)
+cached = st.session_state.get("insights_result")
+if cached is None or cached[0] != key:
+    runner = get_job_runner()
+    job_id = st.session_state.get("insights_job")
+    job = runner.status(job_id) if job_id else None
+    if job is None or job["key"] != key:
+        job_id = runner.submit("insights", generate_all, profile, key=key, backend=backend)
+        st.session_state["insights_job"] = job_id
+        job = runner.status(job_id)
+
+    if job["status"] in ACTIVE_STATES:
+        st.progress(job["progress"], text=f"⏳ {job['message'] or 'Generating insights...'}")
+        if st.button("✖ Cancel"):
+            runner.cancel(job_id)
+        time.sleep(1.0)
+        st.rerun()
+
+    if job["status"] in (CANCELLED, FAILED):
+        if job["status"] == CANCELLED:
+            st.warning("Insight generation was cancelled.")
+        else:
+            st.error("Insight generation failed.")
+            st.code(job["error"] or job["message"])
+        if st.button("🔁 Try again"):
+            runner.discard(job_id)
+            st.session_state.pop("insights_job", None)
+            st.rerun()
+        st.stop()
+
+    results = runner.result(job_id)
+    runner.discard(job_id)
+    st.session_state.pop("insights_job", None)
+    if results is None:
+        st.rerun()
+    cached = (key, results)
+    st.session_state["insights_result"] = cached
+
+results = cached[1]
 
 tab1, tab2, tab3 = st.tabs([
     "Explain Columns",
@@ -30,15 +83,14 @@ tab1, tab2, tab3 = st.tabs([
 
 with tab1:
     st.subheader("Explain Dataset Columns")
-    column_explanations = explain_columns(df)
-    st.write(column_explanations)
+    st.table({"column": list(results[explain_columns.TASK]),
+              "explanation": list(results[explain_columns.TASK].values())})
 
 with tab2:
     st.subheader("Summarize Dataset")
-    summary_text = summarize_dataset(df)
-    st.write(summary_text)
+    st.write(results[summarize.TASK])
 
 with tab3:
     st.subheader("AI Insights & Observations")
-    insights = generate_insights(df)
-    st.write(insights)
+    for item in results[insights.TASK]:
+        st.markdown(f"- {item}")
@@ -0,0 +1,31 @@
+from benchmarks.datagen import make_dataset
+from benchmarks.run import compare, run_suite
+
+
+def test_make_dataset_is_seeded():
+    a = make_dataset(n_rows=200, n_numeric=3, n_categorical=2, cardinality=50, seed=1)
+    b = make_dataset(n_rows=200, n_numeric=3, n_categorical=2, cardinality=50, seed=1)
+
+    assert a.equals(b)
+    assert a.shape == (200, 6)
+    assert 0 < a["num_0"].isna().mean() < 0.2
+
+
+def test_run_suite_records_metrics():
+    out = run_suite(["tiny"], ["rare_category_merger"], repeats=1, log=lambda _: None)
+    (row,) = out["results"]
+
+    assert row["component"] == "rare_category_merger"
+    assert row["rows"] == 500
+    assert row["seconds"] > 0 and row["rows_per_sec"] > 0
+    assert row["peak_mem_mb"] is not None
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"results": [{"component": "c", "scale": "s", "seconds": 1.0, "peak_mem_mb": 100.0}]}
+    slower = {"results": [{"component": "c", "scale": "s", "seconds": 1.2, "peak_mem_mb": 200.0}]}
+
+    regressions = compare(slower, baseline, tolerance=0.25)
+
+    assert [r["metric"] for r in regressions] == ["peak_mem_mb"]
+    assert compare(baseline, baseline) == []
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.eda import column_index
+from core.eda.column_index import ColumnIndex, column_decisions, name_tokens
+from core.preprocess import fit_preprocessor
+
+
+def _users(n=2_000, seed=0):
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({
+        "user_id": [f"u{i}" for i in range(n)],
+        "age": rng.randint(18, 80, size=n),
+        "country": rng.choice(["fr", "de", "it"], size=n),
+    })
+
+
+def _orders(n=6_000, n_users=2_000, seed=1):
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({
+        "order_id": np.arange(n),
+        "customerId": [f"u{i}" for i in rng.randint(0, n_users, size=n)],
+        "Country": rng.choice(["fr", "de", "it", "es"], size=n),
+        "amount": np.exp(rng.normal(3, 1, size=n)),
+    })
+
+
+def test_name_normalization():
+    assert name_tokens("CustomerID") == name_tokens("customer_id") == name_tokens("customer id")
+
+
+def test_similar_columns_and_join_keys(tmp_path):
+    index = ColumnIndex(tmp_path)
+    assert index.add_dataset("users.csv", _users()) == 3
+
+    similar = index.similar_columns(_orders(), k=1)
+    joins = index.join_candidates(_orders())
+
+    assert similar["Country"][0]["column"] == "country"
+    assert similar["customerId"][0]["column"] == "user_id"
+    assert [(j["source_column"], j["column"]) for j in joins] == [("customerId", "user_id")]
+
+
+def test_incremental_updates_persist(tmp_path):
+    index = ColumnIndex(tmp_path)
+    index.add_dataset("users.csv", _users())
+
+    assert index.add_dataset("users.csv", _users()) == 0  # unchanged content is skipped
+    assert index.add_dataset("users.csv", _users().drop(columns="age")) == 2  # changed content replaces
+    index.add_dataset("orders.csv", _orders())
+
+    reloaded = ColumnIndex(tmp_path)
+    assert reloaded.index.ntotal == len(reloaded.entries) == 6
+    assert reloaded.similar_columns(_users(), exclude_dataset="users.csv", k=1)["country"][0]["dataset"] == "orders.csv"
+
+
+def test_numpy_fallback_matches_faiss_interface(tmp_path, monkeypatch):
+    monkeypatch.setattr(column_index, "faiss", None)
+    index = ColumnIndex(tmp_path)
+    index.add_dataset("users.csv", _users())
+    index.remove_dataset("users.csv")
+
+    assert type(index.index).__name__ == "_NumpyIndex"
+    assert index.index.ntotal == 0
+    assert index.similar_columns(_orders())["Country"] == []
+
+
+def test_recorded_decisions_are_returned_with_matches(tmp_path):
+    df = _users()
+    result = fit_preprocessor(df, config={"max_unique_for_onehot": 10})
+    index = ColumnIndex(tmp_path)
+    index.add_dataset("users.csv", df)
+    index.record_decisions("users.csv", column_decisions(result.summary["meta"]))
+
+    matches = index.similar_columns(_orders(), k=1)
+
+    assert matches["Country"][0]["decisions"]["role"] == "onehot"
+    assert matches["customerId"][0]["decisions"] == {"role": "high_cardinality", "encoding": "hashing"}
+
+
+def test_related_columns_reuse_stored_fingerprints(tmp_path, monkeypatch):
+    index = ColumnIndex(tmp_path)
+    index.add_dataset("users.csv", _users())
+    index.add_dataset("orders.csv", _orders())
+    expected_similar = index.similar_columns(_orders(), k=1, exclude_dataset="orders.csv")
+    expected_joins = index.join_candidates(_orders(), exclude_dataset="orders.csv")
+
+    def no_fingerprinting(*args, **kwargs):
+        raise AssertionError("stored entries should be reused")
+    monkeypatch.setattr(column_index, "column_fingerprint", no_fingerprinting)
+    related = index.related_columns("orders.csv", k=1)
+
+    assert related["similar"] == expected_similar
+    assert related["joins"] == expected_joins
+    assert index.related_columns("missing.csv") == {"similar": {}, "joins": []}
+
+
+def test_faiss_index_round_trip(tmp_path):
+    pytest.importorskip("faiss")
+    index = ColumnIndex(tmp_path)
+    index.add_dataset("users.csv", _users())
+    index.add_dataset("orders.csv", _orders())
+    index.remove_dataset("users.csv")
+
+    # reloads through faiss.read_index of the file written by save()
+    reloaded = ColumnIndex(tmp_path)
+    assert (tmp_path / "index.faiss").exists()
+    assert type(reloaded.index).__name__.startswith("IndexIDMap")
+    assert reloaded.index.ntotal == len(reloaded.entries) == 4
+    assert reloaded.similar_columns(_users(), k=1)["country"][0]["dataset"] == "orders.csv"
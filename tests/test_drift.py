@@ -0,0 +1,164 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.deploy.drift import DriftMonitor, psi
+from core.preprocess import fit_preprocessor, save_preprocess_artifacts
+from core.preprocess.drift_reference import build_reference, load_reference
+
+
+def _train(n=5_000, seed=0):
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({
+        "x": rng.normal(10, 2, size=n),
+        "y": rng.exponential(1.0, size=n),
+        "city": rng.choice(["a", "b", "c"], p=[0.6, 0.3, 0.1], size=n),
+    })
+
+
+def _traffic(n=2_000, seed=1, shifted=False):
+    df = _train(n, seed)
+    if shifted:
+        df["x"] += 3
+        df["city"] = np.where(np.arange(n) % 2 == 0, "d", df["city"])
+    return df
+
+
+def test_reference_from_data_and_from_fitted_stats():
+    result = fit_preprocessor(_train(), config={"profile": True})
+    from_data = result.summary["drift_reference"]
+    from_stats = build_reference(result.pipeline)
+
+    for ref in (from_data, from_stats):
+        assert set(ref["numeric"]) == {"x", "y"}
+        assert np.isclose(sum(ref["numeric"]["x"]["expected"]), 1.0)
+        assert set(ref["categorical"]["city"]["categories"]) == {"a", "b", "c"}
+    assert from_data["numeric"]["x"]["source"] == "data"
+    assert from_stats["numeric"]["x"]["source"] == "scaler"
+    # RareCategoryMerger frequencies reproduce the training shares
+    stats_city = dict(zip(from_stats["categorical"]["city"]["categories"], from_stats["categorical"]["city"]["expected"]))
+    assert abs(stats_city["a"] - 0.6) < 0.03
+
+
+def test_reference_from_stats_skips_columns_dropped_by_imputer():
+    train = _train()[["x", "y"]].assign(empty=np.nan)[["empty", "x", "y"]]
+    result = fit_preprocessor(train, config={"missing_indicator": False})
+
+    ref = build_reference(result.pipeline)
+
+    assert set(ref["numeric"]) == {"x", "y"}
+    # x's bins come from x's own scaler stats (mean 10, sd 2), not the next column's
+    edges = ref["numeric"]["x"]["edges"]
+    assert 9 < np.median(edges) < 11
+    assert 1.5 < (edges[-1] - edges[0]) / (2 * 1.2816) < 2.5
+
+
+def _with_missing(df, share=0.1, seed=2):
+    # y is left out: the scaler-based fallback assumes normal bins, which a skewed column doesn't fit
+    rng = np.random.RandomState(seed)
+    df = df[["x", "city"]].copy()
+    for col in ("x", "city"):
+        df.loc[rng.rand(len(df)) < share, col] = np.nan
+    return df
+
+
+def test_fallback_reference_handles_missing_values():
+    result = fit_preprocessor(_with_missing(_train()), config={"missing_indicator": False})
+    reference = build_reference(result.pipeline)  # what serving falls back to without drift_reference.json
+
+    city = reference["categorical"]["city"]
+    assert abs(city["expected"][-1] - 0.1) < 0.02
+    assert np.isclose(sum(city["expected"]), 1.0)
+
+    monitor = DriftMonitor(reference, min_samples=500)
+    monitor.observe(_with_missing(_traffic(), seed=3))
+    report = monitor.score()
+
+    assert report["drifted"] == []
+    assert report["features"]["x"]["psi"] < 0.1 and report["features"]["city"]["psi"] < 0.1
+
+
+def test_monitor_scores_stable_and_drifted_traffic():
+    reference = fit_preprocessor(_train()).summary["drift_reference"]
+    monitor = DriftMonitor(reference, min_samples=500)
+
+    traffic = _traffic()
+    for start in range(0, len(traffic), 200):
+        monitor.observe(traffic.iloc[start:start + 200])
+    stable = monitor.score()
+    monitor.observe(_traffic(shifted=True))
+    drifted = monitor.score()
+
+    assert stable["rows"] == 2_000 and stable["drifted"] == []
+    assert drifted["drifted"] == ["city", "x"]
+    assert drifted["features"]["x"]["ks"] > 0.4
+    assert drifted["features"]["y"]["status"] == "stable"
+
+
+def test_small_windows_accumulate_and_full_queue_drops():
+    reference = fit_preprocessor(_train()).summary["drift_reference"]
+    monitor = DriftMonitor(reference, min_samples=100, max_queue=1)
+
+    assert monitor.observe(_traffic(50))
+    assert not monitor.observe(_traffic(50))
+    assert monitor.score() is None and monitor.rows == 50
+    monitor.observe(_traffic(60))
+
+    report = monitor.score()
+    assert report["rows"] == 110 and report["dropped_batches"] == 1
+
+
+def test_background_thread_scores_on_schedule():
+    reference = fit_preprocessor(_train()).summary["drift_reference"]
+    monitor = DriftMonitor(reference, interval=0.05, min_samples=10)
+    monitor.start()
+    try:
+        monitor.observe(_traffic(100))
+        deadline = time.monotonic() + 5
+        while monitor.latest() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        monitor.stop()
+
+    assert monitor.latest()["rows"] == 100
+
+
+def test_psi_is_zero_for_identical_distribution():
+    assert psi([0.5, 0.5, 0.0], [50, 50, 0]) == pytest.approx(0.0, abs=1e-9)
+
+
+def _served_app(tmp_path):
+    from core.deploy.fastapi_app import create_app
+
+    result = fit_preprocessor(_train())
+    paths = save_preprocess_artifacts(result.pipeline, result.processed_df, result.summary, str(tmp_path))
+    assert load_reference(paths["drift_reference"]) == result.summary["drift_reference"]
+    return create_app(paths["pipeline"], reference_path=paths["drift_reference"], min_samples=10)
+
+
+def test_predict_endpoint_feeds_monitor(tmp_path):
+    from core.deploy.request_schema import PredictRequest
+
+    app = _served_app(tmp_path)
+    endpoints = {route.path: route.endpoint for route in app.routes}
+
+    response = endpoints["/predict"](PredictRequest(records=_traffic(20).to_dict(orient="records")))
+    assert response.rows == 20
+    assert endpoints["/drift"]().status == "warming_up"
+
+    assert app.state.monitor.score()["rows"] == 20
+    assert endpoints["/drift"]().status == "ok"
+
+
+def test_app_over_http(tmp_path):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    app = _served_app(tmp_path)
+    with TestClient(app) as client:
+        response = client.post("/predict", json={"records": _traffic(20).to_dict(orient="records")})
+        assert response.status_code == 200 and response.json()["rows"] == 20
+        app.state.monitor.score()
+        assert client.get("/drift").json()["status"] == "ok"
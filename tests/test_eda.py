@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency
+
+from core.eda.analyze import analyze_dataframe
+from core.eda.association import categorical_association
+from core.eda.duplicates import drop_duplicate_rows, exact_duplicate_groups, find_duplicates, near_duplicate_clusters
+
+
+def _cat_frame(n=2_000, seed=0):
+    rng = np.random.RandomState(seed)
+    a = rng.choice(list("abcd"), size=n)
+    return pd.DataFrame({
+        "a": a,
+        "a_copy": pd.Series(a).map({"a": "w", "b": "x", "c": "y", "d": "z"}),
+        "a_coarse": pd.Series(a).map({"a": "lo", "b": "lo", "c": "hi", "d": "hi"}),
+        "noise": rng.choice(list("pqr"), size=n),
+    })
+
+
+def test_cramers_v_matches_chi2_contingency():
+    df = _cat_frame()
+    assoc = categorical_association(df, bias_correction=False)
+
+    table = pd.crosstab(df["a"], df["noise"]).to_numpy()
+    chi2 = chi2_contingency(table, correction=False)[0]
+    expected = np.sqrt(chi2 / table.sum() / (min(table.shape) - 1))
+    assert np.isclose(assoc["cramers_v"].loc["a", "noise"], expected)
+    assert np.isclose(assoc["cramers_v"].loc["a", "a_copy"], 1.0)
+
+
+def test_theils_u_is_asymmetric():
+    u = categorical_association(_cat_frame())["theils_u"]
+
+    # knowing the fine column fully determines the coarse one, not vice versa
+    assert np.isclose(u.loc["a_coarse", "a"], 1.0)
+    assert u.loc["a", "a_coarse"] < 0.6
+    assert u.loc["noise", "a"] < 0.05
+
+
+def test_sparse_and_parallel_paths_agree(monkeypatch):
+    import core.eda.association as association
+
+    df = _cat_frame(n=500)
+    df["id"] = [f"id{i % 300}" for i in range(len(df))]
+    dense = categorical_association(df, n_jobs=1)
+
+    monkeypatch.setattr(association, "DENSE_CELL_LIMIT", 0)
+    monkeypatch.setattr(association, "PARALLEL_MIN_WORK", 0)
+    sparse_parallel = categorical_association(df, n_jobs=2)
+
+    pd.testing.assert_frame_equal(dense["cramers_v"], sparse_parallel["cramers_v"])
+    pd.testing.assert_frame_equal(dense["theils_u"], sparse_parallel["theils_u"])
+
+
+def test_analyze_dataframe_includes_association():
+    analysis = analyze_dataframe(_cat_frame(n=200).assign(x=np.arange(200.0)))
+
+    assert set(analysis["categorical_association"]) == {"cramers_v", "theils_u"}
+    assert analysis["categorical_association"]["cramers_v"]["a"]["a_copy"] == 1.0
+
+
+def _rows_frame(n=1_000, seed=0):
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({
+        "id": rng.randint(0, 1_000_000, size=n),
+        "kind": rng.choice(["x", "y", "z"], size=n),
+        "value": rng.normal(size=n),
+        "name": [f"name {i}" for i in range(n)],
+    })
+
+
+def test_exact_duplicate_groups():
+    df = _rows_frame(n=100)
+    df = pd.concat([df, df.iloc[[3, 3, 7]]], ignore_index=True)
+
+    groups = sorted(g.tolist() for g in exact_duplicate_groups(df))
+
+    assert groups == [[3, 100, 101], [7, 102]]
+
+
+def test_near_duplicates_found_without_false_positives():
+    df = _rows_frame()
+    near = df.iloc[:20].assign(kind=lambda d: " " + d["kind"].str.upper(), value=lambda d: d["value"] * 1.00001)
+    df = pd.concat([df, df.iloc[20:25], near], ignore_index=True)
+
+    report = find_duplicates(df, max_groups=None)
+
+    assert report["exact_duplicate_rows"] == 5
+    assert report["near_duplicate_rows"] == 20
+    assert sorted(c for c in report["near_clusters"]) == [[i, 1_005 + i] for i in range(20)]
+
+
+def test_near_duplicate_threshold_is_fraction_of_matching_columns():
+    rng = np.random.RandomState(1)
+    df = pd.DataFrame({f"c{j}": [f"v{j}_{i}" for i in range(200)] for j in range(10)})
+    base = df.iloc[[0]]
+    two_off = base.assign(c0="changed", c1="changed")                       # 8/10 columns match
+    three_off = base.assign(c0="other", c1="other", c2="other")              # 7/10
+    two_off_elsewhere = two_off.assign(c8="moved", c9="moved")               # 6/10 vs base, 8/10 vs two_off
+    df = pd.concat([df, two_off, three_off, two_off_elsewhere], ignore_index=True).sample(frac=1, random_state=rng)
+
+    clusters = [sorted(c.tolist()) for c in near_duplicate_clusters(df.reset_index(drop=True))]
+    labels = df.index.to_numpy()
+    found = sorted(sorted(labels[c].tolist()) for c in clusters)
+
+    # 200 (two_off) is near both base and 202, but base and 202 only share 6/10 columns, so
+    # 200 joins whichever comes first; 201 (three_off) stays out
+    assert found in ([[0, 200]], [[200, 202]])
+    assert analyze_dataframe(df, near=False)["duplicates"]["near_clusters"] == []
+
+
+def test_near_duplicate_chain_is_not_merged_transitively():
+    # each row changes one more of the 5 columns: neighbours match 4/5, row 5 shares nothing with row 0
+    rows, current = [], list("abcde")
+    for k in range(6):
+        if k:
+            current[k - 1] += "X"
+        rows.append(list(current))
+    df = pd.DataFrame(rows, columns=list("pqrst"))
+
+    clusters = [c.tolist() for c in near_duplicate_clusters(df)]
+
+    assert clusters == [[0, 1], [2, 3], [4, 5]]
+    for c in clusters:
+        assert (df.iloc[c[1:]].to_numpy() == df.iloc[c[0]].to_numpy()).mean(axis=1).min() >= 0.8
+    assert drop_duplicate_rows(df, mode="near").index.tolist() == [0, 2, 4]
+
+
+def test_drop_duplicate_rows_keeps_first_occurrence():
+    df = _rows_frame(n=50)
+    df = pd.concat([df, df.iloc[:5], df.iloc[5:10].assign(kind=lambda d: d["kind"].str.upper())], ignore_index=True)
+
+    assert len(drop_duplicate_rows(df, mode="exact")) == 55
+    assert drop_duplicate_rows(df, mode="near").index.tolist() == list(range(50))
+
+
+def test_analyze_dataframe_includes_duplicates():
+    df = _rows_frame(n=100)
+    analysis = analyze_dataframe(pd.concat([df, df.iloc[:2]], ignore_index=True))
+
+    assert analysis["duplicates"]["exact_duplicate_rows"] == 2
+    assert analysis["duplicates"]["exact_groups"] == [[0, 100], [1, 101]]
+
+
+def test_concurrent_reports_use_private_images(tmp_path, monkeypatch):
+    import threading
+    from core.eda.report import generate_visual_eda_report
+
+    monkeypatch.chdir(tmp_path)
+    frames = [_rows_frame(n=200, seed=s).assign(extra=np.arange(200.0) * s) for s in (1, 2)]
+    errors = []
+
+    def run(i):
+        try:
+            generate_visual_eda_report(frames[i], path=str(tmp_path / f"report_{i}.pdf"))
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["report_0.pdf", "report_1.pdf"]
@@ -0,0 +1,106 @@
+import os
+import threading
+
+import pandas as pd
+
+from core.eda.analyze import analyze_dataframe
+from core.preprocess import fit_preprocessor
+from core.utils.jobs import JobRunner, job_key, dataframe_fingerprint, DONE, FAILED, CANCELLED
+
+
+def _slow(release, progress=None):
+    progress(0.1, "waiting")
+    while not release.wait(0.01):
+        progress(0.5, "still waiting")
+    return "finished"
+
+
+def test_job_runs_in_background_and_stores_result(tmp_path):
+    runner = JobRunner(jobs_dir=str(tmp_path))
+    df = pd.DataFrame({"x": [1.0, 2.0, None, 4.0], "c": ["a", "b", "a", None]})
+
+    job_id = runner.submit("preprocess", fit_preprocessor, df, config={"missing_indicator": False})
+    job = runner.wait(job_id, timeout=30)
+
+    assert job["status"] == DONE and job["progress"] == 1.0
+    assert runner.result(job_id).processed_df.shape == (4, 4)
+
+
+def test_identical_active_job_is_deduplicated(tmp_path):
+    runner = JobRunner(jobs_dir=str(tmp_path))
+    release = threading.Event()
+    key = job_key("slow", 1)
+
+    first = runner.submit("slow", _slow, release, key=key)
+    second = runner.submit("slow", _slow, release, key=key)
+    release.set()
+
+    assert first == second
+    assert runner.wait(first, timeout=10)["status"] == DONE
+    # finished jobs are not reused
+    assert runner.submit("slow", _slow, release, key=key) != first
+
+
+def test_cancel_and_failure_are_recorded(tmp_path):
+    runner = JobRunner(jobs_dir=str(tmp_path))
+    release = threading.Event()
+
+    job_id = runner.submit("slow", _slow, release)
+    assert runner.cancel(job_id)
+    assert runner.wait(job_id, timeout=10)["status"] == CANCELLED
+
+    def boom(progress=None):
+        raise ValueError("bad input")
+
+    failed = runner.wait(runner.submit("boom", boom), timeout=10)
+    assert failed["status"] == FAILED
+    assert "bad input" in failed["error"]
+
+
+def test_discard_and_retention_delete_result_files(tmp_path):
+    runner = JobRunner(jobs_dir=str(tmp_path), max_results=2)
+    report = tmp_path / "report.pdf"
+
+    def write_report(progress=None):
+        report.write_text("pdf")
+        return str(report)
+
+    first = runner.submit("report", write_report, files=[str(report)])
+    assert runner.wait(first, timeout=10)["status"] == DONE
+    result_path = runner.status(first)["result_path"]
+    assert runner.discard(first)
+    assert runner.status(first) is None
+    assert not report.exists() and not os.path.exists(result_path)
+
+    jobs = [runner.submit("add", lambda i, progress=None: i, i) for i in range(4)]
+    for job_id in jobs:
+        runner.wait(job_id, timeout=10)
+    runner.purge()
+    # only the newest max_results finished jobs survive
+    assert sum(runner.status(j) is not None for j in jobs) == 2
+    assert len(list((tmp_path / "results").glob("*.pkl"))) == 2
+
+    runner.result_ttl = 0
+    assert runner.purge() == 2
+
+
+def test_profiled_job_keeps_its_spans(tmp_path):
+    runner = JobRunner(jobs_dir=str(tmp_path))
+    df = pd.DataFrame({"x": [1.0, 2.0, 2.0], "c": ["a", "b", "b"]})
+
+    profiled = runner.submit("eda", analyze_dataframe, df, profile=True)
+    plain = runner.submit("eda", analyze_dataframe, df)
+    runner.wait(profiled, timeout=30)
+    runner.wait(plain, timeout=30)
+
+    steps = {s["step"] for s in runner.profile_summary(profiled)["steps"]}
+    assert {"analyze.missing", "analyze.duplicates"} <= steps
+    assert runner.result(profiled)["overview"]["rows"] == 3
+    assert runner.profile_summary(plain) is None
+
+
+def test_dataframe_fingerprint_tracks_content():
+    df = pd.DataFrame({"a": [1, 2, 3]})
+
+    assert dataframe_fingerprint(df) == dataframe_fingerprint(df.copy())
+    assert dataframe_fingerprint(df) != dataframe_fingerprint(df.assign(a=[1, 2, 4]))
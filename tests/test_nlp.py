@@ -0,0 +1,109 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.nlp import backends
+from core.nlp.backends import Prompt, StubBackend
+from core.nlp.explain_columns import build_prompt, explain_columns
+from core.nlp.insights import generate_all, generate_insights
+from core.nlp.profile import build_profile, profile_hash
+from core.nlp.summarize import summarize_dataset
+
+
+class CountingBackend(StubBackend):
+    name = "counting"
+
+    def __init__(self, reply=None):
+        self.calls = []
+        self.reply = reply
+
+    def generate(self, prompts):
+        self.calls.append(len(prompts))
+        return [self.reply(p) for p in prompts] if self.reply else super().generate(prompts)
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(backends, "CACHE_DIR", tmp_path / "nlp")
+
+
+def _df(n=200, seed=0):
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({
+        "age": rng.randint(18, 80, size=n),
+        "income": np.exp(rng.normal(10, 2, size=n)),
+        "city": rng.choice(["paris", "rome"], size=n),
+        "user_id": [f"u{i}" for i in range(n)],
+        "notes": [None] * (n // 2) + ["ok"] * (n - n // 2),
+    })
+
+
+def test_profile_is_compact_and_hash_is_stable():
+    profile = build_profile(_df())
+
+    assert profile["rows"] == 200
+    assert set(profile["columns"]["city"]["top"]) == {"paris", "rome"}
+    assert profile["columns"]["notes"]["missing"] == 0.5
+    assert profile_hash(profile) == profile_hash(build_profile(_df()))
+    assert profile_hash(profile) != profile_hash(build_profile(_df(seed=1)))
+
+
+def test_stub_backend_is_deterministic():
+    explanations = explain_columns(_df(), backend=StubBackend(), use_cache=False)
+
+    assert list(explanations) == ["age", "income", "city", "user_id", "notes"]
+    assert "every value is unique" in explanations["user_id"]
+    assert explanations == explain_columns(_df(), backend=StubBackend(), use_cache=False)
+    assert summarize_dataset(_df(), backend=StubBackend()).startswith("The dataset has 200 rows and 5 columns")
+
+
+def test_insights_flag_quality_issues():
+    found = " ".join(generate_insights(_df(), backend=StubBackend()))
+
+    assert "'user_id' looks like an identifier" in found
+    assert "'notes' is 50% missing" in found
+    assert "'income' is heavily skewed" in found
+
+
+def test_all_tasks_batched_into_one_call_and_cached():
+    backend = CountingBackend()
+    profile = build_profile(_df())
+
+    first = generate_all(profile, backend)
+    second = generate_all(profile, backend)
+
+    assert backend.calls == [3]
+    assert first == second
+
+
+def test_missing_model_lines_fall_back_to_templates():
+    backend = CountingBackend(reply=lambda p: "age: Age of the customer in years.\nsomething else")
+
+    explanations = explain_columns(_df(), backend=backend)
+
+    assert backend.calls == [1]
+    assert explanations["age"] == "Age of the customer in years."
+    assert explanations["city"].startswith("Categorical field with 2 distinct values")
+
+
+def test_prompt_size_does_not_grow_with_rows():
+    small = build_prompt(build_profile(_df(n=100)))
+    large = build_prompt(build_profile(_df(n=50_000)))
+
+    assert isinstance(large, Prompt)
+    assert len(large.text) < 1_000
+    assert abs(len(large.text) - len(small.text)) < 100
+
+
+def test_auto_backend_needs_a_local_model(tmp_path):
+    settings = {"backend": "auto", "model": "", "max_new_tokens": 16}
+    assert backends.get_backend(settings=settings).name == "stub"
+    # a hub id is not a local directory, so nothing is downloaded
+    assert backends.get_backend(settings=dict(settings, model="google/flan-t5-small")).name == "stub"
+    with pytest.raises(ValueError):
+        backends.get_backend("transformers", settings=settings)
+    if importlib.util.find_spec("transformers"):
+        local = backends.get_backend(settings=dict(settings, model=str(tmp_path)))
+        assert local.name == f"transformers:{tmp_path}"
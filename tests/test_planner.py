@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import core.preprocess.pipeline as pipeline
+from core.preprocess import fit_preprocessor
+from core.utils.config import DEFAULT_SETTINGS, load_settings
+from core.utils.file_handler import load_dataset
+from core.utils.planner import plan_execution, plan_for_file
+
+RESOURCES = dict(DEFAULT_SETTINGS["resources"], memory_budget_mb=1000, polars_min_mb=100, chunk_size=50)
+
+
+def test_plan_engine_follows_memory_budget():
+    assert plan_execution(10, 1_000, RESOURCES, available_mb=10_000).engine == "pandas"
+    assert plan_execution(200, 1_000, RESOURCES, available_mb=10_000).engine == "polars"
+
+    chunked = plan_execution(500, 1_000, RESOURCES, available_mb=10_000)
+    assert chunked.engine == "chunked"
+    assert chunked.sample_rows == 500  # 1000 rows * 1000 MB budget / 2000 MB working set
+
+    sampled = plan_execution(5_000, 1_000, RESOURCES, available_mb=10_000)
+    assert sampled.engine == "sampled"
+    assert "exceeds" in sampled.reason
+
+
+def test_settings_merge_toml_over_defaults(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text("[resources]\nchunk_size = 7\n", encoding="utf-8")
+
+    settings = load_settings(str(path))
+
+    assert settings["resources"]["chunk_size"] == 7
+    assert settings["resources"]["memory_fraction"] == DEFAULT_SETTINGS["resources"]["memory_fraction"]
+
+
+def test_load_dataset_sampled_and_chunked(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"x": np.arange(1_000), "c": ["a", "b"] * 500}).to_csv(path, index=False)
+
+    full = load_dataset(str(path), plan_for_file(str(path), RESOURCES, available_mb=10_000))
+    assert len(full) == 1_000
+
+    chunked = load_dataset(str(path), plan_execution(500, 1_000, RESOURCES, available_mb=10_000))
+    assert chunked.shape == (1_000, 2)
+
+    sampled = load_dataset(str(path), plan_execution(5_000, 1_000, RESOURCES, available_mb=10_000))
+    assert 0 < len(sampled) < 1_000
+
+
+def test_load_dataset_streams_with_pinned_column_types(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"x": np.arange(1_000), "code": ["7"] * 999 + ["A7"]}).to_csv(path, index=False)
+    chunked = plan_execution(500, 1_000, RESOURCES, available_mb=10_000)
+
+    default = load_dataset(str(path), chunked)
+    pinned = load_dataset(str(path), chunked, column_types={"code": pa.string()})
+
+    assert str(default.schema["x"]) == "Float64"  # integers widen so later floats still parse
+    assert pinned["code"].cast(str).to_list()[-1] == "A7"
+
+
+def test_fit_preprocessor_chunked_plan_fits_on_sample(monkeypatch):
+    df = pd.DataFrame({"x": np.arange(300, dtype=float), "c": ["a", "b", "c"] * 100})
+    plan = plan_execution(500, len(df), RESOURCES, available_mb=10_000)._replace(sample_rows=100)
+    monkeypatch.setattr(pipeline, "plan_for_frame", lambda _: plan)
+
+    result = fit_preprocessor(df, config={"missing_indicator": False})
+
+    assert result.summary["execution_plan"]["engine"] == "chunked"
+    assert result.processed_df.shape == (300, 4)
+    assert not result.processed_df.isna().any().any()
+
+
+def test_fit_preprocessor_sampled_plan_transforms_every_row(monkeypatch):
+    df = pd.DataFrame({"x": np.arange(300, dtype=float), "c": ["a", "b", "c"] * 100})
+    plan = plan_execution(5_000, len(df), RESOURCES, available_mb=10_000)._replace(sample_rows=15)
+    monkeypatch.setattr(pipeline, "plan_for_frame", lambda _: plan)
+
+    result = fit_preprocessor(df, config={"missing_indicator": False})
+
+    assert result.summary["execution_plan"]["engine"] == "sampled"
+    assert "Not bounded by the plan" in result.summary["execution_plan"]["reason"]
+    assert result.processed_df.shape == (300, 4)
+    assert result.processed_df.index.equals(pd.RangeIndex(300))
+    # rows outside the sample keep their own values, in input order
+    assert result.processed_df[0].is_monotonic_increasing
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from core.preprocess import fit_preprocessor
+from core.preprocess.high_cardinality import TargetEncoder, HashingEncoder
+
+
+def _high_card_df(n=500, seed=0):
+    rng = np.random.RandomState(seed)
+    return pd.DataFrame({
+        "num": rng.normal(size=n),
+        "color": rng.choice(["red", "green", "blue"], size=n),
+        "user_id": [f"u{i}" for i in range(n)],
+        "target": rng.randint(0, 2, size=n),
+    })
+
+
+def test_high_cardinality_column_is_hashed_to_fixed_width():
+    df = _high_card_df()
+    result = fit_preprocessor(df, target_col="target", config={"missing_indicator": False, "hash_n_features": 16})
+    meta = result.summary["meta"]
+
+    assert meta["onehot_categoricals"] == ["color"]
+    assert meta["high_cardinality_categoricals"] == ["user_id"]
+    assert meta["high_cardinality_encoding"] == "hashing"
+    # 1 numeric + 3 one-hot + 16 hash buckets, independent of the 500 ids
+    assert result.processed_df.shape == (500, 20)
+
+
+def test_target_encoding_when_enabled():
+    df = _high_card_df()
+    result = fit_preprocessor(df, target_col="target", config={"missing_indicator": False, "target_encode": True})
+
+    assert result.summary["meta"]["high_cardinality_encoding"] == "target"
+    assert result.processed_df.shape == (500, 5)
+
+
+def test_target_encoder_is_out_of_fold():
+    # every id is unique, so out-of-fold encodings must collapse to the prior
+    X = pd.DataFrame({"id": [f"u{i}" for i in range(200)]})
+    y = np.tile([0, 1], 100)
+    enc = TargetEncoder(n_folds=5, smoothing=1.0)
+
+    oof = enc.fit_transform(X, y)
+    assert np.allclose(oof, oof.mean(), atol=0.05)
+
+    # in-sample encodings do see each row's own target
+    full = enc.transform(X)
+    assert np.corrcoef(full[:, 0], y)[0, 1] > 0.9
+
+    unseen = enc.transform(pd.DataFrame({"id": ["never-seen"]}))
+    assert np.allclose(unseen, enc.prior_)
+
+
+def test_hashing_encoder_is_deterministic():
+    X = pd.DataFrame({"a": ["x", "y", "z", "x"]})
+    enc = HashingEncoder(n_features=8).fit(X)
+    out = enc.transform(X)
+
+    assert out.shape == (4, 8)
+    assert np.array_equal(out[0], out[3])
+    assert np.array_equal(out, enc.transform(X))
+
+
+def test_profile_reports_per_step_timings():
+    df = _high_card_df(n=200)
+    result = fit_preprocessor(df, target_col="target", config={"profile": True})
+    prof = result.summary["profile"]
+    steps = {s["step"]: s for s in prof["steps"]}
+
+    for name in ("fit_preprocessor", "detect_leakage", "pipeline.fit_transform",
+                 "cat.rare.fit_transform", "cat.onehot.fit_transform", "high_card.encode.fit_transform"):
+        assert name in steps
+    assert steps["fit_preprocessor"]["peak_mem_mb"] is not None
+    assert prof["total_seconds"] >= steps["detect_leakage"]["seconds"]
+    assert all(ev["ph"] == "X" for ev in prof["chrome_trace"]["traceEvents"])
+
+
+def test_concurrent_profilers_do_not_share_tracemalloc():
+    import threading
+    import tracemalloc
+    from core.utils.logger import profile, span
+
+    first_in, second_done = threading.Event(), threading.Event()
+    results = {}
+
+    def first():
+        with profile() as prof:
+            first_in.set()
+            with span("first"):
+                second_done.wait(5)
+                _ = np.ones(1_000_000)
+        results["first"] = prof.summary()
+
+    def second():
+        first_in.wait(5)
+        with profile() as prof:
+            with span("second"):
+                pass
+        results["second"] = prof.summary()
+        second_done.set()
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results["first"]["memory_tracked"] and results["first"]["steps"][0]["peak_mem_mb"] >= 7.9
+    assert not results["second"]["memory_tracked"] and results["second"]["steps"][0]["peak_mem_mb"] is None
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_is_off_by_default():
+    result = fit_preprocessor(_high_card_df(n=50), target_col="target")
+
+    assert "profile" not in result.summary
+    assert type(result.pipeline.named_steps["missing_ind"]).__name__ == "MissingIndicatorAdder"
+
+
+def test_dedupe_drops_rows_before_fitting():
+    df = _high_card_df(n=100)
+    df = pd.concat([df, df.iloc[:10]], ignore_index=True)
+
+    result = fit_preprocessor(df, target_col="target", config={"dedupe": "exact"})
+
+    assert result.summary["dedupe"] == {"mode": "exact", "rows_removed": 10}
+    assert result.summary["input_shape"] == (110, 4)
+    assert len(result.processed_df) == 100